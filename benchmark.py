@@ -0,0 +1,247 @@
+"""Times the examples and a few synthetic panels, to check whether a change
+makes Synth Printer faster or slower.
+
+    python benchmark.py                        # everything, saved to benchmark.json
+    python benchmark.py -o new.json --compare benchmark.json
+    python benchmark.py example-08-attenuverter.py jacks-200
+
+Every case runs in its own process, so the peak memory and the caches of one
+don't leak into the others. For each case, the script is run once with all
+its layers (construction, then render), then each layer is built again alone
+by replaying the recorded operations with only that layer enabled. The
+geometry statistics of the rendered panel are saved too, see
+SynthPrinter.statistics(). The peak memory is measured before replaying
+the layers, along with the memory used once everything is imported, most
+of it by OpenCascade.
+
+The render cache is disabled, so every run does the full work.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+directory = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, directory)
+
+# Panels full of mini jacks, placed one by one, to see the cost of each cut
+# as the panel gets busier
+syntheticCases = {"jacks-10": 10, "jacks-50": 50, "jacks-200": 200}
+
+
+def allCases():
+    examples = sorted(glob.glob(os.path.join(directory, "example-*.py")))
+    return [os.path.basename(example) for example in examples] + list(syntheticCases)
+
+
+def syntheticPanel(count: int, show_object):
+    """The layout of a synthetic case: `count` jacks on a grid, 12mm apart."""
+    from synthprinter import SynthPrinter
+
+    columns = min(count, 20)
+    rows = (count + columns - 1) // columns
+    sp = SynthPrinter()
+    sp.addPanel(columns * 12 + 12, rows * 12 + 12)
+    for index in range(count):
+        sp.addMiniJack(12 + index % columns * 12, 12 + index // columns * 12)
+    sp.render(show_object)
+    return {"sp": sp}
+
+
+def peakMemory():
+    """Peak resident memory of this process in MB, None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # bytes, kilobytes elsewhere
+        return round(peak / 1024 / 1024, 1)
+    return round(peak / 1024, 1)
+
+
+def runCase(case: str):
+    """Runs a single case in this process, and returns its timings."""
+    import runpy
+
+    import synthprinter
+
+    SynthPrinter = synthprinter.SynthPrinter
+    SynthPrinter.defaultConfig["renderCache"] = False
+
+    # Time every render() separately from the rest of the script
+    renderTime = []
+    render = SynthPrinter.render
+
+    def timedRender(self, *args, **kwargs):
+        start = time.perf_counter()
+        render(self, *args, **kwargs)
+        renderTime.append(time.perf_counter() - start)
+
+    SynthPrinter.render = timedRender
+
+    def show_object(*args, **kwargs):
+        pass
+
+    importMemory = peakMemory()
+    start = time.perf_counter()
+    if case in syntheticCases:
+        scope = syntheticPanel(syntheticCases[case], show_object)
+    else:
+        scope = runpy.run_path(
+            os.path.join(directory, case),
+            init_globals={"show_object": show_object},
+            run_name="__main__",
+        )
+    total = time.perf_counter() - start
+    SynthPrinter.render = render
+
+    result = {
+        "construction": round(total - sum(renderTime), 3),
+        "render": round(sum(renderTime), 3),
+        "total": round(total, 3),
+        # Before the layers are replayed below, so it's the script's own
+        "peakMemory": peakMemory(),
+        "importMemory": importMemory,  # Mostly OpenCascade
+        "layers": {},
+    }
+
+    # Then each layer alone, on the last panel of the script
+    panels = [value for value in scope.values() if isinstance(value, SynthPrinter)]
+    if panels:
+        sp = panels[-1]
+        result["statistics"] = sp.statistics()
+        for name in SynthPrinter.layerNames:
+            if not sp.config[name + "Render"]:
+                continue
+            config = dict(
+                sp.config, renderCache=False, parallelLayers=False, lazyLayers=False
+            )
+            for layer in SynthPrinter.layerNames:
+                config[layer + "Render"] = layer == name
+            layer = SynthPrinter(**config)
+            start = time.perf_counter()
+            layer.replayOperations(sp.operations)
+            construction = time.perf_counter() - start
+            start = time.perf_counter()
+            layer.render()
+            result["layers"][name] = {
+                "construction": round(construction, 3),
+                "render": round(time.perf_counter() - start, 3),
+            }
+
+    return result
+
+
+def runCases(cases: list):
+    """Runs every case in a new process, printing results as they come."""
+    results = {}
+    for case in cases:
+        process = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--case", case],
+            capture_output=True,
+            text=True,
+            cwd=directory,
+        )
+        if process.returncode == 0:
+            results[case] = json.loads(process.stdout.strip().splitlines()[-1])
+            print(
+                "{:>8.2f}s  {:>8}MB  {}".format(
+                    results[case]["total"], str(results[case]["peakMemory"]), case
+                ),
+                flush=True,
+            )
+        else:
+            results[case] = {"error": process.stderr.strip().splitlines()[-1:]}
+            print("  FAILED            " + case, flush=True)
+            print(process.stderr, file=sys.stderr, flush=True)
+    return results
+
+
+def compare(previous: dict, current: dict):
+    """Prints the timings of both runs side by side."""
+    print()
+    print("{:<40} {:>9} {:>9} {:>8}".format("", "before", "after", "ratio"))
+    for case, result in current["cases"].items():
+        before = previous["cases"].get(case)
+        if not before or "error" in before or "error" in result:
+            continue
+        rows = [(case, before["total"], result["total"])]
+        for name, layer in result["layers"].items():
+            if name in before["layers"]:
+                rows.append(
+                    (
+                        "  " + name,
+                        sum(before["layers"][name].values()),
+                        sum(layer.values()),
+                    )
+                )
+        rows.append(("  peak memory (MB)", before["peakMemory"], result["peakMemory"]))
+        if before.get("importMemory") and result["importMemory"]:
+            rows.append(
+                (
+                    "  peak memory over imports (MB)",
+                    before["peakMemory"] - before["importMemory"],
+                    result["peakMemory"] - result["importMemory"],
+                )
+            )
+        if "statistics" in before and "statistics" in result:
+            for name, layer in result["statistics"]["layers"].items():
+                rows.append(
+                    (
+                        "  {} faces".format(name),
+                        before["statistics"]["layers"][name]["faces"],
+                        layer["faces"],
+                    )
+                )
+        for label, old, new in rows:
+            if old is None or new is None or (old == 0 and new == 0):
+                continue
+            ratio = new / old if old else float("nan")
+            print("{:<40} {:>9.2f} {:>9.2f} {:>7.2f}x".format(label, old, new, ratio))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks Synth Printer.")
+    parser.add_argument(
+        "cases", nargs="*", help="examples or synthetic cases (default: all)"
+    )
+    parser.add_argument(
+        "-o", "--output", default="benchmark.json", help="default: benchmark.json"
+    )
+    parser.add_argument("--compare", help="a previous output to compare against")
+    parser.add_argument("--case", help=argparse.SUPPRESS)  # Used internally
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(runCase(args.case)))
+        return
+
+    import cadquery
+
+    results = {
+        "python": platform.python_version(),
+        "cadquery": cadquery.__version__,
+        "machine": platform.machine(),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "cases": runCases(
+            [os.path.basename(case) for case in args.cases] or allCases()
+        ),
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -40,14 +40,11 @@ sp.addMiniToggleSwitch(hp(4), 40)
 sp.addPotentiometer(hp(4), 20)
 sp.addKnob(hp(4), 20, 12, 16)
 
-sp.addLed5mm(32, 10)
-sp.addLed5mm(37, 15)
-sp.addLed5mm(32, 20)
-sp.addLed5mm(37, 25)
-sp.addLed5mm(32, 30)
-sp.addLed5mm(37, 35)
-sp.addLed5mm(32, 40)
-sp.addLed5mm(37, 45)
+# Rows of identical footprints can be added all at once, which
+# is a lot faster. Pass a list of (x, y) pairs, or a NumPy array.
+sp.addLeds5mm(
+    [(32, 10), (37, 15), (32, 20), (37, 25), (32, 30), (37, 35), (32, 40), (37, 45)]
+)
 
 # Be sure to take a look at the functions in synthprinter.py!
 # Their docstring comments often include more information about
@@ -11,19 +11,9 @@ sp.addEurorackPanel(16)
 sp.add1UIJCradle(hp(8), 14, 14, True, "horizontal", supportBottom=False)
 # sp.add1UIJCradle(hp(8), 54, 14, True, "horizontal", supportTop=False)
 
-sp.addMiniJack(hp(2), 104)
-sp.addMiniJack(hp(4), 104)
-sp.addMiniJack(hp(7), 104)
-sp.addMiniJack(hp(9), 104)
-sp.addMiniJack(hp(12), 104)
-sp.addMiniJack(hp(14), 104)
-
-sp.addMiniJack(hp(2), 104 + hp(2.5))
-sp.addMiniJack(hp(4), 104 + hp(2.5))
-sp.addMiniJack(hp(7), 104 + hp(2.5))
-sp.addMiniJack(hp(9), 104 + hp(2.5))
-sp.addMiniJack(hp(12), 104 + hp(2.5))
-sp.addMiniJack(hp(14), 104 + hp(2.5))
+# Two rows of six jacks, placed all at once. grid() defaults to the
+# kcol / krow grid, but takes any function to convert the columns and rows.
+sp.addMiniJacks(grid([2, 4, 7, 9, 12, 14], [0, 2.5], hp, lambda row: 104 + hp(row)))
 
 sp.supportBar(hp(5.5) - 2, 92, 4, 25, 4)
 sp.supportBar(hp(10.5) - 2, 92, 4, 25, 4)
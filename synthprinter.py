@@ -1,4 +1,144 @@
+import argparse
+import concurrent.futures
+import contextlib
+import functools
+import glob
+import hashlib
+import html
+import json
+import math
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import zipfile
+
 import cadquery as cq
+import numpy as np
+from OCP.BRep import BRep_Tool
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.BRepTools import BRepTools
+from OCP.TopAbs import TopAbs_REVERSED
+from OCP.TopLoc import TopLoc_Location
+
+# Footprint solids only depend on their settings, not their position, so they
+# are built once per process. See SynthPrinter._footprint()
+_footprintCache = {}
+
+
+# The layer each kind of operation works on, for the profile report
+_operationLayers = (
+    ("cut", "panel"),
+    ("engrave", "panel"),
+    ("preview", "preview"),
+    ("mark", "drillTemplate"),
+    ("support", "supports"),
+    ("emboss", "emboss"),
+)
+
+
+def _operation(method):
+    """Decorates the methods that place things on the layers, to record them
+    in `SynthPrinter.operations`. Only the outermost call is recorded, calls it
+    makes to other methods are part of the same operation.
+
+    With the `profile` setting, every call is timed, nested ones too."""
+    layer = next(
+        (
+            layer
+            for prefix, layer in _operationLayers
+            if method.__name__.startswith(prefix)
+        ),
+        "all",
+    )
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.config["profile"]:
+            with self._profiling(method.__name__, layer):
+                return perform(self, args, kwargs)
+        return perform(self, args, kwargs)
+
+    def perform(self, args, kwargs):
+        if self._operationDepth == 0:
+            self.operations.append(
+                {
+                    "op": method.__name__,
+                    "args": _plainData(list(args)),
+                    "kwargs": _plainData(kwargs),
+                }
+            )
+            if self.config["parallelLayers"] or self.config["lazyLayers"]:
+                return  # Performed when the layers are built, see render()
+        self._operationDepth += 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._operationDepth -= 1
+            if self._operationDepth == 0 and not self.config["layerHistory"]:
+                self._dropLayerHistory()
+
+    wrapper.isOperation = True
+    return wrapper
+
+
+def _plainData(value):
+    """Converts tuples and NumPy values to lists and numbers, so operations
+    can be saved as JSON and compared with what was loaded back."""
+    if isinstance(value, dict):
+        return {key: _plainData(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plainData(item) for item in value]
+    if hasattr(value, "tolist"):  # NumPy arrays and scalars
+        return _plainData(value.tolist())
+    return value
+
+
+def _replayLayers(config: dict, operations: list, names: tuple, build=True):
+    """Replays the operations on a new panel with only the layers in `names`
+    enabled, and finishes them unless `build` is False. Returns the shapes of
+    every layer by name, the number of booleans, the profile, the drill
+    template marks, the settings changed by the operations, like the panel
+    size, and the frame. Runs in the worker processes of parallelLayers."""
+    config = dict(config, parallelLayers=False, lazyLayers=False, renderCache=False)
+    for name in SynthPrinter.layerNames:
+        config[name + "Render"] = name in names
+    # supportLattice() keeps clear of the panel cuts, so they are queued for
+    # the supports too, but the panel isn't built
+    cutsOnly = "supports" in names and "panel" not in names
+    if cutsOnly:
+        config["panelRender"] = True
+    sp = SynthPrinter(**config)
+    settings = dict(sp.config)
+    sp.replayOperations(operations)
+    if build and not cutsOnly:
+        sp._buildLayers()
+    layers = {
+        name: [
+            shape for shape in getattr(sp, name).vals() if isinstance(shape, cq.Shape)
+        ]
+        for name in SynthPrinter.layerNames
+    }
+    changed = {key: value for key, value in sp.config.items() if settings[key] != value}
+    return layers, sp.booleans, sp.profile, sp._drillMarks, changed, sp.frame
+
+
+def _layer(name: str):
+    """A layer of SynthPrinter, as a CadQuery workplane. With the lazyLayers
+    setting, it's built the first time it's read after render()."""
+
+    def get(self):
+        if name in self._pendingLayers:
+            self._buildLayer(name)
+        return self._layers[name]
+
+    def set(self, value):
+        self._layers[name] = value
+
+    return property(get, set)
 
 
 class SynthPrinter:
@@ -17,9 +157,8 @@ class SynthPrinter:
     In most cases, you want to call those methods instead of making the individual calls
     bundled in the `addX()` methods.
     - `cutX()`: makes a hole for X on the **panel** layer
-    - `markX()`: draws marks for X on the **drillTemplate** layer.
-    *Exporting a drill template is a WIP, it still takes a bit of tinkering to
-    make the PDF the proper size.*
+    - `markX()`: draws marks for X on the **drillTemplate** layer, and for
+    `exportDrillTemplate()`, which works even if the layer is disabled.
     - `previewX()`: draws boxes and cylinders to preview the size of footprints
     on the **preview** layer
     - `embossX()`: creates an element on the **emboss** layer. You can only 3D print
@@ -31,6 +170,10 @@ class SynthPrinter:
     panels and hold in place PCBs. You can only 3D print supports if you orient
     your panel with the front as the first layer.
 
+    Every call to those methods is recorded in `operations`, a list of plain
+    data that can be saved with `exportOperations()` and turned back into a
+    panel with `importOperations()`, without running your script again.
+
     Be sure to take a look at the bundled examples!
     """
 
@@ -234,6 +377,45 @@ class SynthPrinter:
         "DrillTemplateMarkLength": 10,
         "DrillTemplateMarkThickness": 0.2,
         "DrillTemplateDistance": -80,
+        ###########################################################
+        ### Performance
+        ###########################################################
+        # Cuts are queued and subtracted from the panel all at once during
+        # render(), see _flushPanelCuts(). Disable to see every cut applied immediately,
+        # which is much slower on dense panels.
+        "deferredCuts": True,
+        # Finished layers are saved to this directory, and loaded back by
+        # render() when the settings and operations haven't changed.
+        # The least recently used entries are removed past renderCacheSize (MB).
+        # Only operations are compared: changes made directly to the layers,
+        # like `sp.supports = sp.supports.extrude(...)`, aren't noticed, so
+        # don't enable it on panels that do that.
+        "renderCache": False,
+        "renderCacheDirectory": os.path.join(
+            os.path.expanduser("~"), ".cache", "synthprinter"
+        ),
+        "renderCacheSize": 500,
+        # Operations are only recorded, and render() builds every enabled
+        # layer in its own process by replaying them. The layers stay empty
+        # until render(). Only worth it with several cores and busy layers.
+        # The settings changed by operations, like panelWidth, are only
+        # updated once the layers are built, and changes made directly to
+        # the layers are lost.
+        "parallelLayers": False,
+        # Operations are only recorded, and each layer is built by replaying
+        # them the first time it's shown, exported or read after render(),
+        # whether its <layer>Render setting is enabled or not. A script that
+        # only exports the panel never builds the previews. Takes precedence
+        # over parallelLayers, and has the same limits.
+        "lazyLayers": False,
+        # Layers are CadQuery workplanes, which keep every intermediate shape
+        # in their parent chain. Disable to keep only the current shapes after
+        # each operation, so memory stays proportional to the finished panel
+        # on long builds. The layers then have no history to end() back to.
+        "layerHistory": True,
+        # Times every operation and boolean, and prints a report sorted by
+        # the time spent after render(), see profileReport().
+        "profile": False,
     }
     """
     You can override any of the defaultConfig settings by passing them as a
@@ -254,13 +436,23 @@ class SynthPrinter:
     first. But with a different process than FDM 3D printing, you will want to
     make your own configuration profile."""
 
+    layerNames = ("panel", "preview", "emboss", "supports", "drillTemplate")
+
+    panel = _layer("panel")
+    preview = _layer("preview")
+    emboss = _layer("emboss")
+    supports = _layer("supports")
+    drillTemplate = _layer("drillTemplate")
+
     def __init__(self, **kwargs):
         self.config = self.defaultConfig.copy()
 
         # override defaults
+        self.settings = {}  # The overrides, saved along with the operations
         for key, value in kwargs.items():
             if key in self.config:
                 self.config[key] = value
+                self.settings[key] = value
 
         # call lambdas
         for key, value in self.config.items():
@@ -268,6 +460,9 @@ class SynthPrinter:
                 self.config[key] = value(self.config)
 
         # Create layers
+        self._layers = {}
+        self._pendingLayers = set()  # Not built yet, see lazyLayers
+        self._freshLayers = {}  # Without history, see _dropLayerHistory()
         self.panel = cq.Workplane("XY")
         self.preview = cq.Workplane("XY")
         self.emboss = cq.Workplane("XY")
@@ -276,6 +471,28 @@ class SynthPrinter:
 
         self.panelAdded = False  # We can only have one or horrible things happen
 
+        # Top-left corner of the panel as seen from the front, set once by
+        # addPanel(). Everything is placed relative to it, see _at()
+        self.frame = cq.Location()
+
+        # Tool solids waiting to be subtracted from the panel, see _cutPanel()
+        self._panelCuts = []
+        # Every tool cut from the panel, deferred or not, see supportLattice()
+        self._cutTools = []
+
+        # 2D shapes of the drill template, see markOutline()
+        self._drillMarks = []
+
+        self._rendered = False  # For buildPanels(), which renders if needed
+
+        # Calls and seconds by (name, layer) with the profile setting
+        self.profile = {}
+        self.booleans = 0  # Made by the shared helpers, see statistics()
+
+        # Every placement made on this panel, in order, see _operation()
+        self.operations = []
+        self._operationDepth = 0
+
     #######################################################################
     #######################################################################
     #######################################################################
@@ -293,23 +510,50 @@ class SynthPrinter:
         If you give it the show_object function from Cq Editor as an
         argument, it will also display the object. When using Synth Printer
         from a different environment, just call without any argument.
+
+        With the `renderCache` setting, the rendered layers are loaded from
+        the cache directory when nothing changed since they were saved.
+
+        With the `lazyLayers` setting, layers are only built when they are
+        shown, exported or read, one by one, so some may never be.
         """
-        # Shave off the sides of the panel if needed
-        self.cutPanelWidthTolerance()
-        # Move the supports where they belong
-        self.supports = self.supports.translate(
-            (0, 0, self.config["panelThickness"] / 2)
-        )
-        # Move the drill template above the panel
-        self.drillTemplate = self.drillTemplate.translate(
-            (0, 0, self.config["DrillTemplateDistance"])
-        )
-        # Rotate the layers for viewing
-        self.panel = self.panel.rotate((0, 0, 0), (1, 0, 0), 180)
-        self.preview = self.preview.rotate((0, 0, 0), (1, 0, 0), 180)
-        self.emboss = self.emboss.rotate((0, 0, 0), (1, 0, 0), 180)
-        self.supports = self.supports.rotate((0, 0, 0), (1, 0, 0), 180)
-        self.drillTemplate = self.drillTemplate.rotate((0, 0, 0), (1, 0, 0), 180)
+        self._rendered = True
+        cacheKey = None
+        cached = None
+        if self.config["lazyLayers"]:
+            self._pendingLayers = set(self.layerNames)
+        elif self.config["renderCache"]:
+            cacheKey = self._cacheKey("render", self.operations)
+            cached = self._loadCacheEntry(cacheKey)
+        if self.config["lazyLayers"]:
+            pass  # See _buildLayer()
+        elif cached is not None:
+            for name in self.layerNames:
+                layer = cq.Workplane("XY")
+                if name in cached:
+                    layer = layer.newObject([cached[name]])
+                setattr(self, name, layer)
+            self._panelCuts = []
+        else:
+            with self._profiled("render", "all"):
+                if self.config["parallelLayers"]:
+                    self._buildLayersInParallel()
+                else:
+                    self._buildLayers()
+            for name in self.layerNames:
+                self._placeLayer(name)
+            if cacheKey is not None:
+                layers = {}
+                for name in self.layerNames:
+                    shape = self._layerShape(name)
+                    if shape is not None:
+                        layers[name] = shape
+                self._storeCacheEntry(cacheKey, layers)
+        if self.config["profile"] and not self.config["lazyLayers"]:
+            print(self.profileReport())
+            print(json.dumps(self.statistics(), indent=2))
+        if show_object is _showNothing:
+            show_object = False  # Don't build lazy layers just to show them
         # Display the layers if we're in CQ Editor
         if show_object and self.config["panelRender"]:
             show_object(
@@ -342,32 +586,427 @@ class SynthPrinter:
                 options=self.config["drillTemplateShowOptions"],
             )
 
-    def exportDrillTemplate(self, filename: str = "DrillTemplate.svg"):
-        """Exports the drill template as a SVG file.
-
-        Before you print it, crop and scale it up or down in image editing
-        software to match the size of one side!
-
-        TODO: Make it the perfect size out of the box.
+    def _dropLayerHistory(self):
+        """Replaces every layer changed since the last call by a new workplane
+        holding only its current shapes, see the layerHistory setting."""
+        for name in self.layerNames:
+            layer = self._layers[name]
+            if layer is self._freshLayers.get(name):
+                continue  # Not changed by the operation
+            shapes = [shape for shape in layer.vals() if isinstance(shape, cq.Shape)]
+            self._freshLayers[name] = cq.Workplane("XY").newObject(shapes)
+            self._layers[name] = self._freshLayers[name]
+
+    def _placeLayer(self, name: str):
+        """Moves a finished layer where it belongs, and rotates it for
+        viewing. Shapes are only moved, not copied, so the previews keep
+        sharing the geometry of their footprint."""
+        offset = 0
+        if name == "supports":
+            offset = self.config["panelThickness"] / 2
+        if name == "drillTemplate":  # Above the panel
+            offset = self.config["DrillTemplateDistance"]
+        location = cq.Location(cq.Vector(), cq.Vector(1, 0, 0), 180) * cq.Location(
+            cq.Vector(0, 0, offset)
+        )
+        layer = getattr(self, name)
+        setattr(
+            self,
+            name,
+            layer.newObject(
+                [
+                    shape.moved(location)
+                    for shape in layer.vals()
+                    if isinstance(shape, cq.Shape)
+                ]
+            ),
+        )
 
-        You must activate the layer in the constructor first! Otherwise,
-        drill marks are not rendered, for performance."""
-        cq.exporters.export(
-            self.drillTemplate,
-            filename,
-            opt={
-                "width": 2000,
-                "height": 2000,
-                "marginLeft": 0,
-                "marginTop": 0,
-                "showAxes": False,
-                "projectionDir": (0.0, 0.0, 1.0),
-                "strokeWidth": 0.25,
-                "strokeColor": (255, 0, 0),
-                "hiddenColor": (0, 0, 255),
-                "showHidden": False,
-            },
+    def _buildLayer(self, name: str):
+        """Builds a single layer for lazyLayers, by replaying the operations
+        with only this layer enabled, see _replayLayers(). With renderCache,
+        each layer has its own cache entry."""
+        self._pendingLayers.discard(name)
+        cacheKey = None
+        cached = None
+        if self.config["renderCache"]:
+            cacheKey = self._cacheKey("layer", name, self.operations)
+            cached = self._loadCacheEntry(cacheKey)
+        if cached is not None:
+            setattr(self, name, cq.Workplane("XY").newObject(list(cached.values())))
+            return
+        with self._profiled("render: " + name, name):
+            layers, booleans, profile, _, settings, self.frame = _replayLayers(
+                self.config, self.operations, (name,)
+            )
+        self._addProfile(booleans, profile)
+        self.config.update(settings)
+        setattr(self, name, cq.Workplane("XY").newObject(layers[name]))
+        self._placeLayer(name)
+        if cacheKey is not None:
+            shape = self._layerShape(name)
+            self._storeCacheEntry(cacheKey, {} if shape is None else {name: shape})
+
+    def _buildLayers(self):
+        """Finishes the layers before they are moved in place."""
+        # Shave off the sides of the panel if needed
+        self.cutPanelWidthTolerance()
+        # Apply all the queued cuts at once
+        self._flushPanelCuts()
+
+    def _buildLayersInParallel(self):
+        """Builds every enabled layer in a separate process, see _replayLayers().
+        Disabled layers can still get a few shapes, like the panel itself,
+        those and the drill template marks are replayed here in the meantime.
+        The panel cuts are left to its worker, when the panel is enabled."""
+        names = [name for name in self.layerNames if self.config[name + "Render"]]
+        with concurrent.futures.ProcessPoolExecutor(len(names) or 1) as pool:
+            futures = {
+                name: pool.submit(_replayLayers, self.config, self.operations, (name,))
+                for name in names
+            }
+            results = [
+                _replayLayers(self.config, self.operations, (), "panel" not in names)
+            ]
+            layers = results[0][0]
+            for name, future in futures.items():
+                results.append(future.result())
+                layers[name] = results[-1][0][name]
+        for name, shapes in layers.items():
+            setattr(self, name, cq.Workplane("XY").newObject(shapes))
+        self._drillMarks = results[0][3]
+        self.config.update(results[0][4])
+        self.frame = results[0][5]
+        for _, booleans, profile, _, _, _ in results:
+            self._addProfile(booleans, profile)
+
+    def _addProfile(self, booleans: int, profile: dict):
+        """Adds the booleans and profile of a replayed panel to ours."""
+        self.booleans += booleans
+        for key, (calls, seconds) in profile.items():
+            entry = self.profile.setdefault(key, [0, 0.0])
+            entry[0] += calls
+            entry[1] += seconds
+
+    def _boolean(self, name: str, layer: str):
+        """Counts a boolean in `booleans`, and profiles it like _profiled()."""
+        self.booleans += 1
+        return self._profiled("boolean: " + name, layer)
+
+    def _profiled(self, name: str, layer: str):
+        """Context manager adding the time spent inside to the profile, when
+        the profile setting is enabled. Does nothing otherwise."""
+        if not self.config["profile"]:
+            return contextlib.nullcontext()
+        return self._profiling(name, layer)
+
+    @contextlib.contextmanager
+    def _profiling(self, name: str, layer: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.profile.setdefault((name, layer), [0, 0.0])
+            entry[0] += 1
+            entry[1] += time.perf_counter() - start
+
+    def statistics(self):
+        """Counts the solids, faces, edges and vertices of each layer, and the
+        booleans performed so far. Call it after `render()`.
+
+        The face count is what drives the size of exported STL files and
+        the slicing time, so it's a good way to catch a footprint producing
+        way more faces than it should.
+
+        Only booleans made by the shared helpers are counted: the panel cuts
+        and the unions of drill template marks, but not those hidden in
+        CadQuery calls such as `cutThruAll()`. Previews are never fused.
+        With the render cache, a render loaded from the cache makes no
+        booleans.
+
+        With lazyLayers, only the layers built so far are counted."""
+        layers = {}
+        for name in self.layerNames:
+            if name in self._pendingLayers:
+                continue
+            shape = self._layerShape(name)
+            compound = cq.Compound.makeCompound([] if shape is None else [shape])
+            layers[name] = {
+                "solids": len(compound.Solids()),
+                "faces": len(compound.Faces()),
+                "edges": len(compound.Edges()),
+                "vertices": len(compound.Vertices()),
+            }
+        return {"booleans": self.booleans, "layers": layers}
+
+    def profileReport(self, limit: int = None):
+        """Returns the time spent in each operation and boolean, by name and
+        layer, slowest first. Requires the profile setting.
+
+        Operations include the time of the operations they call: addX()
+        includes cutX(), previewX(), etc. Booleans are included in the
+        operations that make them, or in render() for the panel cuts."""
+        rows = sorted(self.profile.items(), key=lambda item: -item[1][1])[:limit]
+        lines = [
+            "{:<32} {:<14} {:>7} {:>10} {:>10}".format(
+                "name", "layer", "calls", "total (s)", "each (ms)"
+            )
+        ]
+        for (name, layer), (calls, seconds) in rows:
+            lines.append(
+                "{:<32} {:<14} {:>7} {:>10.3f} {:>10.2f}".format(
+                    name, layer, calls, seconds, seconds / calls * 1000
+                )
+            )
+        return "\n".join(lines)
+
+    def exportOperations(self, filename: str = "Operations.json"):
+        """Saves the settings passed to the constructor and every operation
+        performed on the panel as a JSON file, that `importOperations()`
+        turns back into a panel.
+
+        Each operation is the name of the method, and its arguments:
+        `{"op": "addMiniJack", "args": [10.16, 20], "kwargs": {}}`"""
+        # One operation per line, so layouts are easy to diff
+        operations = ",\n  ".join(
+            json.dumps(operation, default=repr) for operation in self.operations
         )
+        with open(filename, "w") as file:
+            file.write('{"settings": ')
+            json.dump(self.settings, file, default=repr)
+            file.write(',\n "operations": [\n  ' + operations + "\n ]\n}\n")
+
+    @classmethod
+    def importOperations(cls, filename: str = "Operations.json", **kwargs):
+        """Creates a panel from a file saved by `exportOperations()`.
+        Settings passed as parameters override the saved ones, for example,
+        to enable a layer.
+
+        Don't forget to call `render()` on it!"""
+        with open(filename) as file:
+            data = json.load(file)
+        sp = cls(**{**data["settings"], **kwargs})
+        sp.replayOperations(data["operations"])
+        return sp
+
+    def replayOperations(self, operations: list):
+        """Performs a list of operations, as recorded in `operations`."""
+        for operation in operations:
+            method = getattr(self, operation["op"], None)
+            if not getattr(method, "isOperation", False):
+                raise ValueError("Unknown operation: " + repr(operation["op"]))
+            method(*operation["args"], **operation["kwargs"])
+
+    def _cacheKey(self, *data):
+        """Hash of this file, the settings, and `data`, to name cache entries."""
+        with open(__file__, "rb") as source:
+            sourceHash = hashlib.sha256(source.read()).hexdigest()
+        return hashlib.sha256(
+            json.dumps(
+                [sourceHash, self.config, data], sort_keys=True, default=repr
+            ).encode()
+        ).hexdigest()
+
+    def _loadCacheEntry(self, key: str):
+        """Returns the shapes saved under `key` by name, or None if there is
+        no such entry in the cache directory."""
+        entry = os.path.join(self.config["renderCacheDirectory"], key)
+        if not os.path.isdir(entry):
+            return None
+        shapes = {
+            filename[: -len(".bin")]: cq.Shape.importBin(os.path.join(entry, filename))
+            for filename in os.listdir(entry)
+        }
+        os.utime(entry)  # Most recently used
+        return shapes
+
+    def _storeCacheEntry(self, key: str, shapes: dict):
+        """Saves shapes by name under `key`, then evicts the least recently
+        used entries until the cache fits in `renderCacheSize`."""
+        directory = self.config["renderCacheDirectory"]
+        os.makedirs(directory, exist_ok=True)
+        # Written to a temporary directory first so a half-written entry
+        # can never be loaded
+        temporary = tempfile.mkdtemp(dir=directory, prefix=".")
+        for name, shape in shapes.items():
+            shape.exportBin(os.path.join(temporary, name + ".bin"))
+        try:
+            os.rename(temporary, os.path.join(directory, key))
+        except OSError:  # Another render saved it first
+            shutil.rmtree(temporary, ignore_errors=True)
+
+        entries = []
+        for name in os.listdir(directory):
+            entry = os.path.join(directory, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            size = sum(
+                os.path.getsize(os.path.join(entry, filename))
+                for filename in os.listdir(entry)
+            )
+            entries.append((os.path.getmtime(entry), size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.config["renderCacheSize"] * 1024 * 1024:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def _layerShape(self, name: str):
+        """The shapes of a layer as a single shape, None if it's empty."""
+        shapes = [
+            shape for shape in getattr(self, name).vals() if isinstance(shape, cq.Shape)
+        ]
+        if len(shapes) == 1:
+            return shapes[0]
+        if shapes:
+            return cq.Compound.makeCompound(shapes)
+        return None
+
+    def _exportedShape(self, layer: str, allowEmpty: bool = False):
+        """The shape of a layer to export, after checking it's ready. None if
+        the layer is empty and `allowEmpty`."""
+        if layer not in self.layerNames:
+            raise ValueError(
+                f"Unknown layer {layer!r}, options are: " + ", ".join(self.layerNames)
+            )
+        if not self._rendered:
+            raise Warning("Call render() before exporting")
+        shape = self._layerShape(layer)
+        if shape is None and not allowEmpty:
+            raise ValueError(f"The {layer} layer is empty, is it enabled?")
+        return shape
+
+    def exportSTL(
+        self,
+        filename: str = "Panel.stl",
+        layer: str = "panel",
+        tolerance: float = 0.1,
+        angularTolerance: float = 0.1,
+    ):
+        """Exports a layer as STL, after `render()`. Layers are "panel",
+        "supports", "emboss" and "preview".
+
+        Curved surfaces are approximated by triangles: `tolerance` is the
+        largest gap allowed between them and the real surface, relative to
+        the size of each edge (0.1 is 10%), and `angularTolerance` the largest
+        angle between neighboring triangles in radians. Raise them for quick
+        draft prints, holes will be a bit more faceted, but the files are
+        smaller and exported faster. The defaults are plenty for FDM printing.
+
+        The file is binary, and written face by face as they are meshed,
+        so the memory used doesn't grow with the size of the file."""
+        _writeSTL(filename, self._exportedShape(layer), tolerance, angularTolerance)
+
+    def exportSTEP(self, filename: str = "Panel.step", layer: str = "panel"):
+        """Exports a layer as STEP, after `render()`. STEP keeps the exact
+        geometry, so there's no tolerance to pick, see `exportSTL()`."""
+        cq.exporters.export(self._exportedShape(layer), filename, "STEP")
+
+    def export3MF(
+        self,
+        filename: str = "Panel.3mf",
+        layer="panel",
+        tolerance: float = 0.1,
+        angularTolerance: float = 0.1,
+    ):
+        """Exports a layer as 3MF, after `render()`. Like STL, but smaller,
+        and in millimeters for sure. See `exportSTL()` for the tolerances.
+
+        `layer` can also be a list of layers, like
+        `("panel", "supports", "emboss")`: they are saved in one file, as
+        the parts of a single object, each with its own material and already
+        in place, ready for multi-material printing. Empty layers are
+        skipped."""
+        layers = [layer] if isinstance(layer, str) else list(layer)
+        parts = []
+        for name in layers:
+            shape = self._exportedShape(name, len(layers) > 1)
+            if shape is not None:
+                color = self.config[name + "ShowOptions"]["color"]
+                parts.append((name, shape, color))
+        if not parts:
+            raise ValueError("The layers are all empty: " + ", ".join(layers))
+        _write3MF(filename, parts, tolerance, angularTolerance)
+
+    def exportDrillTemplate(
+        self,
+        filename: str = "DrillTemplate.svg",
+        paper: str = None,
+        margin: float = 10,
+        overlap: float = 15,
+    ):
+        """Exports the drill template at 1:1 scale, as SVG or PDF depending
+        on the extension of `filename`. Print it at 100% or "actual size",
+        not "fit to page".
+
+        By default, the page is the size of the panel. With `paper` set to
+        "A4" or "Letter", the panel is tiled across as many pages as needed,
+        with `margin` mm left blank for the printer around each page. Pages
+        overlap by `overlap` mm, and registration marks in the overlaps
+        appear on both pages: stack the pages so they line up, and tape them
+        together. Each page has a 50mm line to check the print scale. With
+        SVG, every page is its own file, numbered after `filename`.
+
+        The marks are written directly from the layout, the drillTemplate
+        layer doesn't need to be enabled, nor the panel rendered."""
+        _writeDrillTemplates([(self, "")], filename, paper, margin, overlap)
+
+    def _drillTemplateMarks(self):
+        """The 2D marks of the drill template, see markOutline(). Call it
+        before using the panel size, which is also only recorded with
+        parallelLayers or lazyLayers until then."""
+        recordOnly = self.config["parallelLayers"] or self.config["lazyLayers"]
+        if recordOnly and not self._drillMarks:
+            # The operations were only recorded, see parallelLayers
+            _, _, _, self._drillMarks, settings, _ = _replayLayers(
+                self.config, self.operations, (), False
+            )
+            self.config.update(settings)
+        return self._drillMarks
+
+    def _drillTemplatePages(self, paper: str, margin: float, overlap: float):
+        """Splits the panel in tiles, one per page. Returns the size of the
+        pages and a list of (x, y, width, height) tiles on the panel, in mm.
+        Without paper, there's a single page the size of the panel."""
+        width = self.config["panelWidth"]
+        height = self.config["panelHeight"]
+        if paper is None:
+            return (width, height), [(0, 0, width, height)]
+        if paper not in paperSizes:
+            raise ValueError(
+                f"Unknown paper size {paper!r}, options are: " + ", ".join(paperSizes)
+            )
+        best = None
+        # Portrait or landscape, whichever needs fewer pages
+        for pageWidth, pageHeight in (paperSizes[paper], paperSizes[paper][::-1]):
+            areaWidth = pageWidth - margin * 2
+            areaHeight = pageHeight - margin * 2
+            columns = max(1, math.ceil((width - overlap) / (areaWidth - overlap)))
+            rows = max(1, math.ceil((height - overlap) / (areaHeight - overlap)))
+            if best is None or columns * rows < best[0]:
+                tiles = [
+                    (
+                        column * (areaWidth - overlap),
+                        row * (areaHeight - overlap),
+                        min(areaWidth, width - column * (areaWidth - overlap)),
+                        min(areaHeight, height - row * (areaHeight - overlap)),
+                    )
+                    for row in range(rows)
+                    for column in range(columns)
+                ]
+                best = (columns * rows, (pageWidth, pageHeight), tiles)
+        return best[1], best[2]
+
+    def _registrationMarks(self, tiles: list, overlap: float):
+        """Points in the middle of the overlaps between tiles, on the panel."""
+        points = []
+        for x, y, width, height in tiles:
+            if x > 0:  # Overlap with the tile on the left
+                points.append((x + overlap / 2, y + height / 2))
+            if y > 0:  # Overlap with the tile above
+                points.append((x + width / 2, y + overlap / 2))
+        return points
 
     #######################################################################
     #######################################################################
@@ -379,18 +1018,14 @@ class SynthPrinter:
     ### Basic operations
     #######################################################################
 
+    @_operation
     def cutHole(self, x: float, y: float, diameter: float, depth: float = None):
         """Makes a circular hole, default depth is through the entire panel
 
         x, y define the center."""
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .hole(diameter, depth)
-        )
+        self._cutPanel(self._cylinderTool(x, y, diameter, depth))
 
+    @_operation
     def cutRect(
         self,
         x: float,
@@ -410,61 +1045,227 @@ class SynthPrinter:
         if depth == 0:
             depth = self.config["panelThickness"]
 
-        cutout = cq.Workplane("XY").box(width, height, depth)
+        if not centered:
+            x = x + width / 2
+            y = y + height / 2
 
-        if centered:
-            cutout = cutout.translate(
-                (
-                    -self.config["panelWidth"] / 2 + x,
-                    -self.config["panelHeight"] / 2 + y,
-                    0,
-                )
-            )
-        else:
-            cutout = cutout.translate(
-                (
-                    -self.config["panelWidth"] / 2 + x + width / 2,
-                    -self.config["panelHeight"] / 2 + y + height / 2,
-                    0,
-                )
-            )
+        cutout = cq.Solid.makeBox(
+            width, height, depth, cq.Vector(-width / 2, -height / 2, -depth / 2)
+        )
+        self._cutPanel(cutout.moved(self._at(x, y)))
+
+    # Every cut on the panel layer goes through _cutPanel() as a tool solid,
+    # so cuts can be batched instead of each doing a boolean against the
+    # whole panel. Tools are built centered on the origin, back of the panel
+    # at +Z, then moved in place with _at(), which only depends on the frame
+    # set by addPanel() and never on what was already cut.
+
+    def _at(self, x: float, y: float):
+        """Location of x, y on the panel, from the top-left as seen from the front."""
+        return self.frame * cq.Location(cq.Vector(x, y, 0))
+
+    def _cylinder(self, diameter: float, depth: float = None):
+        """A cylinder going from the back of the panel towards the front.
+        The default depth is through the entire panel."""
+        if depth is None:
+            depth = self.config["panelThickness"]
+        return cq.Solid.makeCylinder(
+            diameter / 2,
+            depth,
+            cq.Vector(0, 0, self.config["panelThickness"] / 2 - depth),
+        )
+
+    def _box(self, width: float, height: float, depth: float = None):
+        """A box going from the back of the panel towards the front.
+        The default depth is through the entire panel."""
+        if depth is None:
+            depth = self.config["panelThickness"]
+        return cq.Solid.makeBox(
+            width,
+            height,
+            depth,
+            cq.Vector(
+                -width / 2, -height / 2, self.config["panelThickness"] / 2 - depth
+            ),
+        )
+
+    def _cylinderTool(self, x: float, y: float, diameter: float, depth: float = None):
+        """`_cylinder()` centered on x, y."""
+        return self._cylinder(diameter, depth).moved(self._at(x, y))
 
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .cut(cutout)
+    def _boxTool(
+        self, x: float, y: float, width: float, height: float, depth: float = None
+    ):
+        """`_box()` centered on x, y."""
+        return self._box(width, height, depth).moved(self._at(x, y))
+
+    def _footprint(self, kind: str, args: tuple, configKeys: tuple, build):
+        """Returns the solid built by `build()` for a footprint centered on the
+        origin. Footprints are identical wherever they are placed, so each one
+        is only built once per process and then moved in place.
+
+        The cache key is the kind of footprint, its orientation arguments, and
+        the settings it reads (panelThickness is always included)."""
+        key = (
+            kind,
+            args,
+            tuple(self.config[key] for key in ("panelThickness",) + configKeys),
         )
+        if key not in _footprintCache:
+            _footprintCache[key] = build()
+        return _footprintCache[key]
+
+    def _tools(self, *shapes):
+        """Groups the tools of a cut footprint, like a hole and its notch,
+        without fusing them: _cutPanel() queues them one by one, so each
+        can still be cut in 2D, see _compileCuts()."""
+        return cq.Compound.makeCompound(shapes)
+
+    def _fused(self, *shapes):
+        """Fuses shapes into a single one."""
+        if len(shapes) == 1:
+            return shapes[0]
+        with self._boolean("fuse", "-"):
+            return shapes[0].fuse(*shapes[1:]).clean()
+
+    def _offset(self, shape, x: float, y: float):
+        """Moves a shape relative to the center of its footprint."""
+        return shape.moved(cq.Location(cq.Vector(x, y, 0)))
+
+    def _place(self, shape, points):
+        """Copies of a footprint centered on each x, y of `points`, a list of
+        pairs or a NumPy array with one row per point."""
+        return [shape.moved(self._at(float(x), float(y))) for x, y in points]
+
+    def _cutPanel(self, *tools):
+        """Subtracts tool solids from the panel. With `deferredCuts`, they are
+        only queued, and `render()` subtracts them all in a single boolean."""
+        # Footprints group their tools in compounds, see _tools()
+        tools = [solid for tool in tools for solid in tool.Solids()]
+        if not tools:
+            return
+        self._cutTools.extend(tools)
+        if self.config["deferredCuts"]:
+            self._panelCuts.extend(tools)
+            return
+        with self._boolean("cut", "panel"):
+            panel = self.panel.findSolid().cut(*tools).clean()
+        self.panel = self.panel.newObject([panel])
+
+    def _flushPanelCuts(self):
+        """Subtracts every queued tool from the panel at once: the holes in
+        2D, then the rest in a single boolean, see _compileCuts()."""
+        if not self._panelCuts:
+            return
+        panel, tools = self._compileCuts(self.panel.findSolid(), self._panelCuts)
+        if tools:
+            with self._boolean("cut", "panel"):
+                panel = panel.cut(*tools)
+            with self._profiled("boolean: clean", "panel"):
+                panel = panel.clean()
+        self.panel = self.panel.newObject([panel])
+        self._panelCuts = []
+
+    def _compileCuts(self, panel, tools: list):
+        """Turns the tools that are prisms along Z into as few cuts as
+        possible, much faster than cutting them one by one from the solid:
+
+        - the ones going through the whole panel are cut from its outline in
+          2D, and the result is extruded,
+        - the blind ones, like notches and engravings, are grouped by the face
+          they start from and their depth, each group fused in 2D and
+          extruded once.
+
+        Returns the panel, and the tools still to be cut from it."""
+        thickness = self.config["panelThickness"]
+        outline = self._prismProfile(panel)
+        if outline is None or outline[1] - outline[0] < thickness - 1e-6:
+            return panel, tools  # Not a plain slab
+        holes = []
+        groups = {}
+        otherTools = []
+        for tool in tools:
+            prism = self._prismProfile(tool)
+            if prism is None:
+                otherTools.append(tool)
+                continue
+            zmin, zmax, faces = prism
+            front = zmin <= -thickness / 2 + 1e-6
+            back = zmax >= thickness / 2 - 1e-6
+            if front and back:
+                holes.extend(
+                    face.translate((0, 0, -thickness / 2 - zmin)) for face in faces
+                )
+            elif front:
+                depth = round(zmax + thickness / 2, 6)
+                groups.setdefault(("front", depth), []).extend(
+                    face.translate((0, 0, -thickness / 2 - zmin)) for face in faces
+                )
+            elif back:
+                depth = round(thickness / 2 - zmin, 6)
+                groups.setdefault(("back", depth), []).extend(
+                    face.translate((0, 0, thickness / 2 - zmin)) for face in faces
+                )
+            else:  # Inside the panel, can't be cut by anything anyway
+                otherTools.append(tool)
+        if holes:
+            with self._boolean("cut 2D", "panel"):
+                profile = cq.Compound.makeCompound(outline[2]).cut(*holes)
+            solids = [
+                cq.Solid.extrudeLinear(face, cq.Vector(0, 0, thickness))
+                for face in profile.Faces()
+            ]
+            panel = solids[0] if len(solids) == 1 else cq.Compound.makeCompound(solids)
+        for (side, depth), faces in sorted(groups.items()):
+            if len(faces) > 1:
+                with self._boolean("fuse 2D", "panel"):
+                    faces = faces[0].fuse(*faces[1:]).clean().Faces()
+            direction = cq.Vector(0, 0, depth if side == "front" else -depth)
+            otherTools.extend(cq.Solid.extrudeLinear(face, direction) for face in faces)
+        return panel, otherTools
+
+    def _prismProfile(self, shape):
+        """If `shape` is a prism along Z, with the same section all the way,
+        returns its bottom and top Z, and the faces of its bottom. None
+        otherwise."""
+        box = shape.BoundingBox()
+        bottom = []
+        top = []
+        for face in shape.Faces():
+            faceBox = face.BoundingBox()
+            if faceBox.zlen > 1e-6:
+                continue
+            if abs(faceBox.zmin - box.zmin) < 1e-6:
+                bottom.append(face)
+            elif abs(faceBox.zmin - box.zmax) < 1e-6:
+                top.append(face)
+        area = sum(face.Area() for face in bottom)
+        if (
+            not bottom
+            or abs(sum(face.Area() for face in top) - area) > 1e-6 * area
+            or abs(shape.Volume() - area * box.zlen) > 1e-6 * area * box.zlen
+        ):
+            return None
+        return box.zmin, box.zmax, bottom
 
     # TODO: Top-left support!
+    @_operation
     def previewCylinderOnBack(self, x: float, y: float, diameter: float, depth: float):
         """Adds a cylinder for preview on the back of the panel.
         It will be deeper by half the panel thickness.
 
         x, y define the center."""
-        self.preview = (
-            self.preview.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .circle(diameter / 2)
-            .extrude(depth + self.config["panelThickness"] / 2)
-        )
+        self._addPreview(self._previewCylinder(diameter, depth, True), x, y)
 
+    @_operation
     def previewCylinderOnFront(self, x: float, y: float, diameter: float, depth: float):
         """Adds a cylinder for preview on the front of the panel.
         It will be deeper by half the panel thickness.
 
         x, y define the center."""
-        self.preview = (
-            self.preview.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .circle(diameter / 2)
-            .extrude(-depth - self.config["panelThickness"] / 2)
-        )
+        self._addPreview(self._previewCylinder(diameter, depth, False), x, y)
 
+    @_operation
     def previewBoxOnBack(
         self, x: float, y: float, width: float, height: float, depth: float
     ):
@@ -472,15 +1273,9 @@ class SynthPrinter:
         It will be deeper by half the panel thickness.
 
         x, y define the center."""
-        self.preview = (
-            self.preview.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(width, height)
-            .extrude(depth + self.config["panelThickness"] / 2)
-        )
+        self._addPreview(self._previewBox(width, height, depth, True), x, y)
 
+    @_operation
     def previewBoxOnFront(
         self, x: float, y: float, width: float, height: float, depth: float
     ):
@@ -489,19 +1284,46 @@ class SynthPrinter:
 
         x, y define the center.
         """
-        self.preview = (
-            self.preview.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(width, height)
-            .extrude(-depth - self.config["panelThickness"] / 2)
+        self._addPreview(self._previewBox(width, height, depth, False), x, y)
+
+    # Footprints build their preview once with these, see _footprint()
+
+    def _previewCylinder(self, diameter: float, depth: float, onBack: bool):
+        """The solid of `previewCylinderOnBack()` or `previewCylinderOnFront()`,
+        centered on the origin."""
+        depth = depth + self.config["panelThickness"] / 2
+        return cq.Solid.makeCylinder(
+            diameter / 2, depth, cq.Vector(0, 0, 0 if onBack else -depth)
+        )
+
+    def _previewBox(self, width: float, height: float, depth: float, onBack: bool):
+        """The solid of `previewBoxOnBack()` or `previewBoxOnFront()`,
+        centered on the origin."""
+        depth = depth + self.config["panelThickness"] / 2
+        return cq.Solid.makeBox(
+            width,
+            height,
+            depth,
+            cq.Vector(-width / 2, -height / 2, 0 if onBack else -depth),
         )
 
+    def _addPreview(self, shape, x: float, y: float):
+        """Adds a footprint preview built with _footprint() centered on x, y."""
+        self._addPreviews(shape, [(x, y)])
+
+    def _addPreviews(self, shape, points):
+        """Adds a footprint preview on every point. Previews are never fused:
+        the layer is a list of solids, copies of the footprint's only moved
+        in place, so they all share its geometry."""
+        shapes = self._place(shape, points)
+        if shapes:
+            self.preview = self.preview.newObject(self.preview.vals() + shapes)
+
     #######################################################################
     ### Panels
     #######################################################################
 
+    @_operation
     def addPanel(
         self,
         width: float,
@@ -516,9 +1338,6 @@ class SynthPrinter:
         there will be only two by default.
 
 
-        TODO: Add Slots to the drill template
-
-
         screwSlots: options are "auto", "auto-tlbr", "auto-trbl", "auto-center", "none", "all", "tlbr", "trbl", "center"
         """
 
@@ -529,6 +1348,7 @@ class SynthPrinter:
 
         self.config["panelWidth"] = width
         self.config["panelHeight"] = height
+        self.frame = cq.Location(cq.Vector(-width / 2, -height / 2, 0))
 
         # Make the main panel shape
         self.panel = self.panel.box(
@@ -637,19 +1457,30 @@ class SynthPrinter:
                 )
             )
         if screwPoints != []:
-            self.panel = (
-                self.panel.faces(">Z")
-                .workplane()
-                .center(-self.config["panelWidth"] / 2, -self.config["panelHeight"] / 2)
-                .pushPoints(screwPoints)
+            slots = (
+                cq.Workplane("XY")
+                .workplane(offset=-self.config["panelThickness"] / 2)
+                .pushPoints([self._at(x, y) for x, y in screwPoints])
                 .slot2D(
                     self.config["m3screwSlotWidth"],
                     self.config["m3screwSlotHeight"],
                     0,
                 )
-                .cutThruAll()
+                .extrude(self.config["panelThickness"])
+            )
+            self._cutPanel(*slots.vals())
+        for x, y in screwPoints:
+            self._drillMarks.append(
+                (
+                    "slot",
+                    x,
+                    y,
+                    self.config["m3screwSlotWidth"],
+                    self.config["m3screwSlotHeight"],
+                )
             )
 
+    @_operation
     def addEurorackPanel(
         self,
         hp: int,
@@ -669,6 +1500,7 @@ class SynthPrinter:
         self.config["panelWidthTolerance"] = self.config["eurorackWidthTolerance"]
         self.addPanel(self.config["hp"] * hp, self.config["eurorackHeight"], screwSlots)
 
+    @_operation
     def add1UIJPanel(
         self,
         hp: int,
@@ -687,6 +1519,7 @@ class SynthPrinter:
         self.config["panelWidthTolerance"] = self.config["1UIJWidthTolerance"]
         self.addPanel(self.config["hp"] * hp, self.config["1UIJHeight"], screwSlots)
 
+    @_operation
     def addKosmoPanel(
         self,
         khp: int,
@@ -724,26 +1557,20 @@ class SynthPrinter:
         # FIXME: Test print Euro / IJ: Do the tolerances provide enough extrusions?
         if self.config["panelWidthTolerance"] == 0:
             return
-        self.cutRect(
-            0,
-            0,
-            self.config["panelWidthTolerance"],
-            self.config["panelHeight"] * 2,
-            False,
-        )
-
-        self.cutRect(
-            self.config["panelWidth"] - self.config["panelWidthTolerance"] / 2,
-            0,
-            self.config["panelWidthTolerance"],
-            self.config["panelHeight"] * 2,
-            False,
+        # Queued directly rather than with cutRect(), so the render doesn't
+        # record operations that would shave the panel again on replay
+        width = self.config["panelWidthTolerance"]
+        height = self.config["panelHeight"] * 2
+        self._cutPanel(
+            self._boxTool(0, 0, width, height),
+            self._boxTool(self.config["panelWidth"] - width / 2, 0, width, height),
         )
 
     #######################################################################
     ### Panel engravings
     #######################################################################
 
+    @_operation
     def engraveLine(
         self,
         fromX: float,
@@ -773,20 +1600,9 @@ class SynthPrinter:
             .close()
             .extrude(depth)
             .rotate((0, 0, 0), (0, 0, 1), angle)
-            .translate(
-                (
-                    -self.config["panelWidth"] / 2 + fromX,
-                    -self.config["panelHeight"] / 2 + fromY,
-                    -self.config["panelThickness"] / 2,
-                )
-            )
-        )
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .cut(cutout)
+            .translate((0, 0, -self.config["panelThickness"] / 2))
         )
+        self._cutPanel(cutout.val().moved(self._at(fromX, fromY)))
 
     #######################################################################
     ### Rails
@@ -797,6 +1613,7 @@ class SynthPrinter:
     # But it works, so rewrite it yourself if you care.
     # Otherwise, don't bother me about it.
 
+    @_operation
     def cutRail(
         self,
         x: float,
@@ -825,6 +1642,7 @@ class SynthPrinter:
                 centered,
             )
 
+    @_operation
     def supportRail(
         self,
         _x: float,
@@ -888,22 +1706,25 @@ class SynthPrinter:
             if centered:
                 y = y - hp(hpWidth) / 2
 
-        # Can't get rarray to work here.
+        # One screw hole per hp, all cut at once through everything on the
+        # supports layer, like cutThruAll() would
         if orientation == "horizontal":
-            for n in range(hpWidth):
-                self.supports = (
-                    self.supports.moveTo(x + n * self.config["hp"], y)
-                    .circle(self.config["railsScrewDiameter"] / 2)
-                    .cutThruAll()
-                )
+            points = [(x + n * self.config["hp"], y) for n in range(hpWidth)]
         else:
-            for n in range(hpWidth):
-                self.supports = (
-                    self.supports.moveTo(x, y + n * self.config["hp"])
-                    .circle(self.config["railsScrewDiameter"] / 2)
-                    .cutThruAll()
-                )
+            points = [(x, y + n * self.config["hp"]) for n in range(hpWidth)]
+        supports = self.supports.findSolid()
+        box = supports.BoundingBox()
+        hole = cq.Solid.makeCylinder(
+            self.config["railsScrewDiameter"] / 2,
+            box.zlen + 2,
+            cq.Vector(0, 0, box.zmin - 1),
+        )
+        holes = [hole.moved(cq.Location(cq.Vector(x, y, 0))) for x, y in points]
+        with self._boolean("cut", "supports"):
+            supports = supports.cut(*holes).clean()
+        self.supports = self.supports.newObject([supports])
 
+    @_operation
     def addRail(
         self,
         x: float,
@@ -923,6 +1744,7 @@ class SynthPrinter:
         self.cutRail(x, y, hpWidth, centered, orientation)
         self.supportRail(x, y, hpWidth, centered, orientation)
 
+    @_operation
     def previewPanel(
         self,
         x: float,
@@ -975,6 +1797,7 @@ class SynthPrinter:
                     1.6,
                 )
 
+    @_operation
     def addCradle(
         self,
         x: float,
@@ -1113,6 +1936,7 @@ class SynthPrinter:
 
         self.previewPanel(x, y, hpWidth, height, centered, orientation)
 
+    @_operation
     def addEurorackCradle(
         self,
         x: float,
@@ -1161,6 +1985,7 @@ class SynthPrinter:
             supportLeft,
         )
 
+    @_operation
     def add1UIJCradle(
         self,
         x: float,
@@ -1217,6 +2042,7 @@ class SynthPrinter:
     # Every function adding to the supports layer has support at the
     # start of the name.
 
+    @_operation
     def supportBar(
         self,
         x: float,
@@ -1247,6 +2073,159 @@ class SynthPrinter:
             .extrude(depth)
         )
 
+    @_operation
+    def supportLattice(
+        self,
+        x: float = None,
+        y: float = None,
+        width: float = None,
+        height: float = None,
+        depth: float = 3,
+        cell: float = 12,
+        rib: float = 1.2,
+        pattern: str = "hex",
+        clearance: float = 5,
+        keepOuts: list = (),
+    ):
+        """Fills a region of the back of the panel with a lattice of ribs, to
+        stiffen it, or to tie PCBs to it.
+
+        x, y define the top-left of the region as seen from the front. By
+        default, it's the whole panel, except 10mm at the top and bottom
+        where the panel rests on the rails, and 1mm on the sides.
+
+        `cell` is the distance between the centers of the cells, `rib` the
+        thickness of the walls between them, and `pattern` is "hex" or
+        "square".
+
+        The lattice stays `clearance` mm away from everything cut from the
+        panel so far, holes, rails, windows and engravings alike, so call it
+        after placing your footprints with add*() or cut*(), with the panel
+        layer enabled. Raise `clearance` for bigger components, or add
+        (x, y, width, height) rectangles, centered, to `keepOuts`, for
+        components that aren't cut, like those only marked on the drill
+        template.
+
+        The lattice is built once per process for a given panel, region and
+        set of keep-outs, so re-running a script only costs a boolean."""
+        if not self.config["supportsRender"]:
+            return
+        if pattern not in ("hex", "square"):
+            raise ValueError('pattern must be "hex" or "square"')
+        x = 1 if x is None else x
+        y = 10 if y is None else y
+        if width is None:
+            width = self.config["panelWidth"] - x * 2
+        if height is None:
+            height = self.config["panelHeight"] - y * 2
+        # The outlines of the cuts made so far, by a key that tells them
+        # apart for the cache. Faces are kept apart from their location on
+        # the lattice, offset2D() gets located wires wrong.
+        cuts = {}
+        for tool in self._cutTools:
+            box = tool.BoundingBox()
+            prism = self._prismProfile(tool)
+            if prism is None:  # Its bounding box will do
+                faces = [
+                    (
+                        self._latticeFace(box.xlen, box.ylen),
+                        cq.Location(cq.Vector(box.center.x, box.center.y, 0)),
+                    )
+                ]
+            else:
+                flat = cq.Location(cq.Vector(0, 0, -prism[0]))
+                faces = [
+                    (face.located(cq.Location()), flat * face.location())
+                    for face in prism[2]
+                ]
+            key = tuple(
+                round(value, 4)
+                for value in (box.xmin, box.ymin, box.xmax, box.ymax, tool.Volume())
+            )
+            cuts[key] = faces
+        holes = tuple(sorted(cuts))
+        keepOuts = tuple(tuple(float(value) for value in rect) for rect in keepOuts)
+
+        def build():
+            # Everything is done in 2D, much faster than with solids, and
+            # the lattice extruded at the end
+            if pattern == "hex":
+                # Flat-topped hexagons, every other column half a cell lower
+                stepX, stepY, shift = cell * math.sqrt(3) / 2, cell, cell / 2
+            else:
+                stepX, stepY, shift = cell, cell, 0
+            points = [
+                (x + column * stepX, y + row * stepY + column % 2 * shift)
+                for column in range(int(width / stepX) + 2)
+                for row in range(-1, int(height / stepY) + 2)
+            ]
+            cells = self._place(self._latticeCell(cell, rib, pattern), points)
+            # Cells are cut short by a rim around the region
+            inside = self._latticeFace(width - rib * 2, height - rib * 2)
+            inside = inside.moved(self._at(x + width / 2, y + height / 2))
+            with self._boolean("intersect", "supports"):
+                tools = [cq.Compound.makeCompound(cells).intersect(inside)]
+            for hole in holes:
+                for face, location in cuts[hole]:
+                    tools.extend(
+                        cq.Face.makeFromWires(wire).moved(location)
+                        for wire in face.outerWire().offset2D(clearance, "arc")
+                    )
+            for holeX, holeY, holeWidth, holeHeight in keepOuts:
+                tool = self._latticeFace(
+                    holeWidth + clearance * 2, holeHeight + clearance * 2
+                )
+                tools.append(tool.moved(self._at(holeX, holeY)))
+            region = self._latticeFace(width, height)
+            region = region.moved(self._at(x + width / 2, y + height / 2))
+            # Not cleaned, it takes longer than everything else
+            with self._boolean("cut", "supports"):
+                region = region.cut(*tools)
+            return cq.Compound.makeCompound(
+                [
+                    cq.Solid.extrudeLinear(face, cq.Vector(0, 0, depth))
+                    for face in region.Faces()
+                ]
+            )
+
+        lattice = self._footprint(
+            "supportLattice",
+            (x, y, width, height, depth, cell, rib, pattern, clearance)
+            + (holes, keepOuts),
+            ("panelWidth", "panelHeight"),
+            build,
+        )
+        with self._boolean("union", "supports"):
+            self.supports = self.supports.union(lattice)
+
+    def _latticeCell(self, cell: float, rib: float, pattern: str):
+        """The 2D hole of a cell of supportLattice(), centered on the origin."""
+        if pattern == "hex":
+            # polygon() takes the diameter of the circumscribed circle
+            build = lambda: cq.Face.makeFromWires(
+                cq.Workplane("XY").polygon(6, (cell - rib) * 2 / math.sqrt(3)).val()
+            )
+        else:
+            build = lambda: self._latticeFace(cell - rib, cell - rib)
+        return self._footprint("latticeCell", (cell, rib, pattern), (), build)
+
+    def _latticeFace(self, width: float, height: float = None):
+        """A rectangle, or a circle of diameter `width` without `height`,
+        centered on the origin, for supportLattice()."""
+        if height is None:
+            wire = cq.Wire.makeCircle(width / 2, cq.Vector(), cq.Vector(0, 0, 1))
+        else:
+            wire = cq.Wire.makePolygon(
+                [
+                    cq.Vector(-width / 2, -height / 2),
+                    cq.Vector(width / 2, -height / 2),
+                    cq.Vector(width / 2, height / 2),
+                    cq.Vector(-width / 2, height / 2),
+                ],
+                close=True,
+            )
+        return cq.Face.makeFromWires(wire)
+
     #######################################################################
     ### Drill template marks
     #######################################################################
@@ -1255,54 +2234,37 @@ class SynthPrinter:
     # look like crosses when exported at typical sizes.
     # Every function adding to the drillTemplate layer has mark at the
     # start of the name
+    #
+    # Marks are always recorded as 2D shapes in _drillMarks, which is what
+    # exportDrillTemplate() writes to SVG. The solids of the drillTemplate
+    # layer are only built when drillTemplateRender is enabled, to see the
+    # marks in CQ Editor.
 
+    @_operation
     def markOutline(self):
         """Add an outline to the drill template layer. This ensures proper
         SVG export. This is automatically done when adding a panel."""
-
-        self.drillTemplate = (
-            self.drillTemplate.moveTo(  # Top
-                0,
-                -self.config["panelHeight"] / 2
-                + self.config["DrillTemplateMarkThickness"] / 2,
-            )
-            .rect(
+        self._drillMarks.append(
+            (
+                "rect",
+                self.config["panelWidth"] / 2,
+                self.config["panelHeight"] / 2,
                 self.config["panelWidth"],
-                self.config["DrillTemplateMarkThickness"],
-            )
-            .extrude(self.config["DrillTemplateMarkThickness"])
-            .moveTo(  # Bottom
-                0,
-                self.config["panelHeight"] / 2
-                - self.config["DrillTemplateMarkThickness"] / 2,
-            )
-            .rect(
-                self.config["panelWidth"],
-                self.config["DrillTemplateMarkThickness"],
-            )
-            .extrude(self.config["DrillTemplateMarkThickness"])
-            .moveTo(  # Left
-                -self.config["panelWidth"] / 2
-                + self.config["DrillTemplateMarkThickness"] / 2,
-                0,
-            )
-            .rect(
-                self.config["DrillTemplateMarkThickness"],
-                self.config["panelHeight"],
-            )
-            .extrude(self.config["DrillTemplateMarkThickness"])
-            .moveTo(  # Right
-                self.config["panelWidth"] / 2
-                - self.config["DrillTemplateMarkThickness"] / 2,
-                0,
-            )
-            .rect(
-                self.config["DrillTemplateMarkThickness"],
                 self.config["panelHeight"],
             )
-            .extrude(self.config["DrillTemplateMarkThickness"])
+        )
+        if not self.config["drillTemplateRender"]:
+            return
+        thickness = self.config["DrillTemplateMarkThickness"]
+        self._addMark(
+            self._rectMark(
+                self.config["panelWidth"], self.config["panelHeight"], thickness
+            ),
+            self.config["panelWidth"] / 2,
+            self.config["panelHeight"] / 2,
         )
 
+    @_operation
     def markCross(self, x: float, y: float):
         """Adds a mark on the drill template layer. At typical synth panel
         sizes, it will show up as a cross the perfect size for printing out and
@@ -1310,73 +2272,107 @@ class SynthPrinter:
 
         x, y define the center of the mark as seen from the front.
         """
-        self.drillTemplate = (
-            self.drillTemplate.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(
-                self.config["DrillTemplateMarkLength"],
-                self.config["DrillTemplateMarkThickness"],
-            )
-            .extrude(self.config["DrillTemplateMarkThickness"])
-            .moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(
-                self.config["DrillTemplateMarkThickness"],
-                self.config["DrillTemplateMarkLength"],
-            )
-            .extrude(self.config["DrillTemplateMarkThickness"])
-        )
+        self._drillMarks.append(("cross", x, y))
+        if not self.config["drillTemplateRender"]:
+            return
+        self._addMark(self._crossMark(), x, y)
 
+    @_operation
     def markRect(self, x: float, y: float, width: float, height: float):
         """Marks a rectangle on the drill template.
 
         x, y define the center."""
+        self._drillMarks.append(("rect", x, y, width, height))
+        if not self.config["drillTemplateRender"]:
+            return
+        self._addMark(self._rectMark(width, height, 1), x, y)
 
-        self.drillTemplate = (
-            self.drillTemplate.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(width, height)
-            .extrude(1)
-            .moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
-            .rect(
-                width - self.config["DrillTemplateMarkThickness"] * 2,
-                height - self.config["DrillTemplateMarkThickness"] * 2,
-            )
-            .cutThruAll()
-        )
-
+    @_operation
     def markHole(self, x: float, y: float, diameter: float):
         """Marks a circular hole on the drill template.
 
-        x, y define the center.
+        x, y define the center. Holes and crosses can be marked in any order.
+        """
+        self._drillMarks.append(("circle", x, y, diameter))
+        if not self.config["drillTemplateRender"]:
+            return
+        self._addMark(self._holeMark(diameter), x, y)
+
+    def _markHoleAndCross(self, diameter: float, points):
+        """`markHole()` and `markCross()` on every point, with a single union."""
+        for x, y in points:
+            self._drillMarks.append(("circle", float(x), float(y), diameter))
+            self._drillMarks.append(("cross", float(x), float(y)))
+        if not self.config["drillTemplateRender"]:
+            return
+        self._addMarks(self._holeAndCrossMark(diameter), points)
 
-        FIXME: Nasty implementation, and requires marking circles before crosses
+    # The solids of the marks, built once with _footprint()
 
-        """
-        self.drillTemplate = (
-            self.drillTemplate.moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
+    def _holeMark(self, diameter: float):
+        """A ring, the width of the marks, its outside the size of the hole."""
+        return self._footprint(
+            "holeMark",
+            (diameter,),
+            ("DrillTemplateMarkThickness",),
+            lambda: cq.Workplane("XY")
             .circle(diameter / 2)
-            .extrude(1)
-            .moveTo(
-                -self.config["panelWidth"] / 2 + x,
-                -self.config["panelHeight"] / 2 + y,
-            )
             .circle(diameter / 2 - self.config["DrillTemplateMarkThickness"])
-            .cutThruAll()
+            .extrude(1)
+            .val(),
         )
-        return
+
+    def _rectMark(self, width: float, height: float, depth: float):
+        """A rectangular frame, the width of the marks."""
+        thickness = self.config["DrillTemplateMarkThickness"]
+        return self._footprint(
+            "rectMark",
+            (width, height, depth),
+            ("DrillTemplateMarkThickness",),
+            lambda: cq.Workplane("XY")
+            .rect(width, height)
+            .rect(width - thickness * 2, height - thickness * 2)
+            .extrude(depth)
+            .val(),
+        )
+
+    def _crossMark(self):
+        thickness = self.config["DrillTemplateMarkThickness"]
+        length = self.config["DrillTemplateMarkLength"]
+        return self._footprint(
+            "crossMark",
+            (),
+            ("DrillTemplateMarkLength", "DrillTemplateMarkThickness"),
+            lambda: self._fused(
+                cq.Solid.makeBox(
+                    length, thickness, thickness, cq.Vector(-length / 2, -thickness / 2)
+                ),
+                cq.Solid.makeBox(
+                    thickness, length, thickness, cq.Vector(-thickness / 2, -length / 2)
+                ),
+            ),
+        )
+
+    def _holeAndCrossMark(self, diameter: float):
+        """The marks of `markHole()` and `markCross()`, centered on the origin."""
+        return self._footprint(
+            "holeAndCrossMark",
+            (diameter,),
+            ("DrillTemplateMarkLength", "DrillTemplateMarkThickness"),
+            lambda: self._fused(self._holeMark(diameter), self._crossMark()),
+        )
+
+    def _addMark(self, shape, x: float, y: float):
+        """Adds marks built with _footprint() centered on x, y."""
+        self._addMarks(shape, [(x, y)])
+
+    def _addMarks(self, shape, points):
+        """Adds marks on every point, with a single union."""
+        shapes = self._place(shape, points)
+        if shapes:
+            shape = self._fused(*shapes)
+            with self._boolean("union", "drillTemplate"):
+                self.drillTemplate = self.drillTemplate.union(shape)
 
     #######################################################################
     ### Buttons and switches
@@ -1384,25 +2380,44 @@ class SynthPrinter:
 
     ### 30mm Arcade Buttons
 
+    @_operation
     def cutArcadeButton30mm(self, x: float, y: float):
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["arcade30mmButtonWithTolerance"])
+        self._cutPanel(
+            self._footprint(
+                "cutArcadeButton30mm",
+                (),
+                ("arcade30mmButtonWithTolerance",),
+                lambda: self._cylinder(self.config["arcade30mmButtonWithTolerance"]),
+            ).moved(self._at(x, y))
+        )
 
+    @_operation
     def previewArcadeButton30mm(self, x: float, y: float):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 32.3, 3.4)
-        self.previewCylinderOnFront(x, y, 24, 7)
-        self.previewCylinderOnBack(x, y, 24, 24.4)
-        self.previewCylinderOnBack(x, y, 34.8, 6.5)
+        self._addPreview(
+            self._footprint(
+                "previewArcadeButton30mm",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(32.3, 3.4, False),
+                    self._previewCylinder(24, 7, False),
+                    self._previewCylinder(24, 24.4, True),
+                    self._previewCylinder(34.8, 6.5, True),
+                ),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def markArcadeButton30mm(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["arcade30mmButtonWithTolerance"])
-        self.markCross(x, y)
+        self._markHoleAndCross(self.config["arcade30mmButtonWithTolerance"], [(x, y)])
 
+    @_operation
     def addArcadeButton30mm(self, x: float, y: float):
         """Should work with all major types of 30mm arcade buttons.
 
@@ -1424,31 +2439,54 @@ class SynthPrinter:
 
     ### 24mm Arcade Buttons
 
+    @_operation
     def cutArcadeButton24mm(self, x: float, y: float):
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["arcade24mmButtonWithTolerance"])
-        self.cutHole(
-            x,
-            y,
-            self.config["arcade24mmButtonAdditionalClearanceDiameter"],
-            self.config["arcade24mmButtonAdditionalClearanceDepth"],
+        self._cutPanel(
+            self._footprint(
+                "cutArcadeButton24mm",
+                (),
+                (
+                    "arcade24mmButtonWithTolerance",
+                    "arcade24mmButtonAdditionalClearanceDiameter",
+                    "arcade24mmButtonAdditionalClearanceDepth",
+                ),
+                lambda: self._tools(
+                    self._cylinder(self.config["arcade24mmButtonWithTolerance"]),
+                    self._cylinder(
+                        self.config["arcade24mmButtonAdditionalClearanceDiameter"],
+                        self.config["arcade24mmButtonAdditionalClearanceDepth"],
+                    ),
+                ),
+            ).moved(self._at(x, y))
         )
 
+    @_operation
     def previewArcadeButton24mm(self, x: float, y: float):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 27, 3.4)
-        self.previewCylinderOnFront(x, y, 22, 7)
-        self.previewCylinderOnBack(x, y, 24, 24.4)
-        self.previewCylinderOnBack(x, y, 28, 6)
+        self._addPreview(
+            self._footprint(
+                "previewArcadeButton24mm",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(27, 3.4, False),
+                    self._previewCylinder(22, 7, False),
+                    self._previewCylinder(24, 24.4, True),
+                    self._previewCylinder(28, 6, True),
+                ),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def markArcadeButton24mm(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["arcade24mmButtonWithTolerance"])
-        self.markCross(x, y)
+        self._markHoleAndCross(self.config["arcade24mmButtonWithTolerance"], [(x, y)])
 
+    @_operation
     def addArcadeButton24mm(self, x: float, y: float):
         """Should work with all major types of 24mm arcade buttons.
 
@@ -1466,6 +2504,7 @@ class SynthPrinter:
 
     ### Mini Toggle Switches
 
+    @_operation
     def cutMiniToggleSwitch(self, x: float, y: float, orientation: str = "horizontal"):
         if not self.config["panelRender"]:
             return
@@ -1476,16 +2515,26 @@ class SynthPrinter:
             width = self.config["miniToggleSwitchLengthWithTolerance"]
             length = self.config["miniToggleSwitchWidthWithTolerance"]
 
-        self.cutHole(x, y, self.config["miniToggleSwitchDiameterWithTolerance"])
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .rect(width, length)
-            .cutBlind(-self.config["miniToggleSwitchNotchDepth"])
+        self._cutPanel(
+            self._footprint(
+                "cutMiniToggleSwitch",
+                (orientation == "horizontal",),
+                (
+                    "miniToggleSwitchWidthWithTolerance",
+                    "miniToggleSwitchLengthWithTolerance",
+                    "miniToggleSwitchDiameterWithTolerance",
+                    "miniToggleSwitchNotchDepth",
+                ),
+                lambda: self._tools(
+                    self._cylinder(
+                        self.config["miniToggleSwitchDiameterWithTolerance"]
+                    ),
+                    self._box(width, length, self.config["miniToggleSwitchNotchDepth"]),
+                ),
+            ).moved(self._at(x, y))
         )
 
+    @_operation
     def previewMiniToggleSwitch(
         self, x: float, y: float, orientation: str = "horizontal"
     ):
@@ -1497,15 +2546,33 @@ class SynthPrinter:
         else:
             width = self.config["miniToggleSwitchLength"]
             length = self.config["miniToggleSwitchWidth"]
-        self.previewBoxOnBack(x, y, width, length, 13.6)
-        self.previewCylinderOnFront(x, y, self.config["miniToggleSwitchDiameter"], 19)
+        self._addPreview(
+            self._footprint(
+                "previewMiniToggleSwitch",
+                (orientation == "horizontal",),
+                (
+                    "miniToggleSwitchWidth",
+                    "miniToggleSwitchLength",
+                    "miniToggleSwitchDiameter",
+                ),
+                lambda: self._fused(
+                    self._previewBox(width, length, 13.6, True),
+                    self._previewCylinder(
+                        self.config["miniToggleSwitchDiameter"], 19, False
+                    ),
+                ),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def markMiniToggleSwitch(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["miniToggleSwitchDiameterWithTolerance"])
-        self.markCross(x, y)
+        self._markHoleAndCross(
+            self.config["miniToggleSwitchDiameterWithTolerance"], [(x, y)]
+        )
 
+    @_operation
     def addMiniToggleSwitch(self, x: float, y: float, orientation: str = "horizontal"):
         """A mini toggle switch, with a retaining notch.
 
@@ -1521,30 +2588,57 @@ class SynthPrinter:
 
     ### PBS-110 7mm Momentary Pushbutton
 
+    @_operation
     def cutMomentaryPushbutton7mm(self, x: float, y: float):
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["momentaryPushbutton7mmDiameterWithTolerance"])
-        self.cutHole(
-            x,
-            y,
-            self.config["momentaryPushbutton7mmNotchDiameterWithTolerance"],
-            self.config["momentaryPushbutton7mmNotchDepth"],
+        self._cutPanel(
+            self._footprint(
+                "cutMomentaryPushbutton7mm",
+                (),
+                (
+                    "momentaryPushbutton7mmDiameterWithTolerance",
+                    "momentaryPushbutton7mmNotchDiameterWithTolerance",
+                    "momentaryPushbutton7mmNotchDepth",
+                ),
+                lambda: self._tools(
+                    self._cylinder(
+                        self.config["momentaryPushbutton7mmDiameterWithTolerance"]
+                    ),
+                    self._cylinder(
+                        self.config["momentaryPushbutton7mmNotchDiameterWithTolerance"],
+                        self.config["momentaryPushbutton7mmNotchDepth"],
+                    ),
+                ),
+            ).moved(self._at(x, y))
         )
 
+    @_operation
     def previewMomentaryPushbutton7mm(self, x: float, y: float):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 7.5, 12)
-        self.previewCylinderOnBack(x, y, 9.5, 13)
+        self._addPreview(
+            self._footprint(
+                "previewMomentaryPushbutton7mm",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(7.5, 12, False),
+                    self._previewCylinder(9.5, 13, True),
+                ),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def markMomentaryPushbutton7mm(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["momentaryPushbutton7mmDiameterWithTolerance"])
-        self.markCross(x, y)
+        self._markHoleAndCross(
+            self.config["momentaryPushbutton7mmDiameterWithTolerance"], [(x, y)]
+        )
 
     # TODO: Recess?
+    @_operation
     def addMomentaryPushbutton7mm(self, x: float, y: float):
         """PBS-110 momentary pushbuttons are commonly used and easy to find in many colors.
 
@@ -1559,6 +2653,7 @@ class SynthPrinter:
     ### Potentiometers, rotary encoders, sliders
     #######################################################################
 
+    @_operation
     def cutPotentiometer(
         self,
         x: float,
@@ -1566,66 +2661,116 @@ class SynthPrinter:
         notchOrientation: str = "all",
         rotaryEncoderNotch: bool = False,
     ):
+        self.cutPotentiometers([(x, y)], notchOrientation, rotaryEncoderNotch)
+
+    @_operation
+    def cutPotentiometers(
+        self, points, notchOrientation: str = "all", rotaryEncoderNotch: bool = False
+    ):
+        """`cutPotentiometer()` on every x, y of a list or NumPy array of points."""
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["potentiometerHoleDiameterWithTolerance"])
-        # List the notches
-        points = []  # default to "none" configuration
-        if notchOrientation == "top" or notchOrientation == "all":
-            points.append((0, -self.config["potentiometerNotchDistanceFromCenter"]))
-        if notchOrientation == "right" or notchOrientation == "all":
-            points.append((self.config["potentiometerNotchDistanceFromCenter"], 0))
-        if notchOrientation == "bottom" or notchOrientation == "all":
-            points.append((0, self.config["potentiometerNotchDistanceFromCenter"]))
-        if notchOrientation == "left" or notchOrientation == "all":
-            points.append((-self.config["potentiometerNotchDistanceFromCenter"], 0))
-        # Cut the notches
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .pushPoints(points)
-            .hole(
-                self.config["potentiometerNotchDiameter"],
-                self.config["potentiometerNotchDepth"],
-            )
-        )
-        # Notch for the encoder
-        if rotaryEncoderNotch:
-            self.panel = (
-                self.panel.faces(">Z")
-                .vertices("<XY")
-                .workplane(centerOption="CenterOfMass")
-                .center(x, y)
-                .rect(
-                    self.config["rotaryEncoderWidthWithTolerance"],
-                    self.config["rotaryEncoderHeightWithTolerance"],
+
+        def build():
+            tools = [
+                self._cylinder(self.config["potentiometerHoleDiameterWithTolerance"])
+            ]
+            # List the notches
+            points = []  # default to "none" configuration
+            if notchOrientation == "top" or notchOrientation == "all":
+                points.append((0, -self.config["potentiometerNotchDistanceFromCenter"]))
+            if notchOrientation == "right" or notchOrientation == "all":
+                points.append((self.config["potentiometerNotchDistanceFromCenter"], 0))
+            if notchOrientation == "bottom" or notchOrientation == "all":
+                points.append((0, self.config["potentiometerNotchDistanceFromCenter"]))
+            if notchOrientation == "left" or notchOrientation == "all":
+                points.append((-self.config["potentiometerNotchDistanceFromCenter"], 0))
+            # The notches
+            for pointX, pointY in points:
+                tools.append(
+                    self._offset(
+                        self._cylinder(
+                            self.config["potentiometerNotchDiameter"],
+                            self.config["potentiometerNotchDepth"],
+                        ),
+                        pointX,
+                        pointY,
+                    )
+                )
+            # Notch for the encoder
+            if rotaryEncoderNotch:
+                tools.append(
+                    self._box(
+                        self.config["rotaryEncoderWidthWithTolerance"],
+                        self.config["rotaryEncoderHeightWithTolerance"],
+                        self.config["rotaryEncoderNotchDepth"],
+                    )
                 )
-                .cutBlind(-self.config["rotaryEncoderNotchDepth"])
+            return self._tools(*tools)
+
+        self._cutPanel(
+            *self._place(
+                self._footprint(
+                    "cutPotentiometer",
+                    (notchOrientation, rotaryEncoderNotch),
+                    (
+                        "potentiometerHoleDiameterWithTolerance",
+                        "potentiometerNotchDistanceFromCenter",
+                        "potentiometerNotchDiameter",
+                        "potentiometerNotchDepth",
+                        "rotaryEncoderWidthWithTolerance",
+                        "rotaryEncoderHeightWithTolerance",
+                        "rotaryEncoderNotchDepth",
+                    ),
+                    build,
+                ),
+                points,
             )
+        )
 
+    @_operation
     def previewPotentiometer(self, x: float, y: float, lugsOrientation: str = "all"):
+        self.previewPotentiometers([(x, y)], lugsOrientation)
+
+    @_operation
+    def previewPotentiometers(self, points, lugsOrientation: str = "all"):
+        """`previewPotentiometer()` on every x, y of a list or NumPy array of points."""
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 6, 21)
-        self.previewCylinderOnFront(x, y, 9.6, 1.6)
-        self.previewCylinderOnBack(x, y, 16, 8)
-        if lugsOrientation == "all" or lugsOrientation == "bottom":
-            self.previewBoxOnBack(x, y + 8, 15, 18, 2.4)
-        if lugsOrientation == "top":
-            self.previewBoxOnBack(x, y - 8, 15, 18, 2.4)
-        if lugsOrientation == "left":
-            self.previewBoxOnBack(x - 8, y, 18, 15, 2.4)
-        if lugsOrientation == "right":
-            self.previewBoxOnBack(x + 8, y, 18, 15, 2.4)
 
+        def build():
+            shapes = [
+                self._previewCylinder(6, 21, False),
+                self._previewCylinder(9.6, 1.6, False),
+                self._previewCylinder(16, 8, True),
+            ]
+            if lugsOrientation == "all" or lugsOrientation == "bottom":
+                shapes.append(self._offset(self._previewBox(15, 18, 2.4, True), 0, 8))
+            if lugsOrientation == "top":
+                shapes.append(self._offset(self._previewBox(15, 18, 2.4, True), 0, -8))
+            if lugsOrientation == "left":
+                shapes.append(self._offset(self._previewBox(18, 15, 2.4, True), -8, 0))
+            if lugsOrientation == "right":
+                shapes.append(self._offset(self._previewBox(18, 15, 2.4, True), 8, 0))
+            return self._fused(*shapes)
+
+        self._addPreviews(
+            self._footprint("previewPotentiometer", (lugsOrientation,), (), build),
+            points,
+        )
+
+    @_operation
     def markPotentiometer(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["potentiometerHoleDiameterWithTolerance"])
-        self.markCross(x, y)
+        self.markPotentiometers([(x, y)])
 
+    @_operation
+    def markPotentiometers(self, points):
+        """`markPotentiometer()` on every x, y of a list or NumPy array of points."""
+        self._markHoleAndCross(
+            self.config["potentiometerHoleDiameterWithTolerance"], points
+        )
+
+    @_operation
     def addPotentiometer(
         self,
         x: float,
@@ -1659,8 +2804,28 @@ class SynthPrinter:
         self.previewPotentiometer(x, y, lugsOrientation)
         self.markPotentiometer(x, y)
 
+    @_operation
+    def addPotentiometers(
+        self,
+        points,
+        notchOrientation: str = "all",
+        lugsOrientation: str = "all",
+        rotaryEncoderNotch: bool = False,
+    ):
+        """Adds a row, column or grid of identical potentiometers at once, see
+        addPotentiometer(). `points` is a list of (x, y) pairs, or a NumPy array
+        with one row per potentiometer.
+
+        All of them are cut in a single boolean, and previewed and marked with
+        a single union each, which is much faster than adding them one by one.
+        """
+        self.cutPotentiometers(points, notchOrientation, rotaryEncoderNotch)
+        self.previewPotentiometers(points, lugsOrientation)
+        self.markPotentiometers(points)
+
         ## TODO: addRotaryEncoder helper
 
+    @_operation
     def cutPcbPotentiometer(
         self,
         x: float,
@@ -1670,20 +2835,42 @@ class SynthPrinter:
     ):
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["pcbPotentiometerHoleDiameterWithTolerance"])
+        self._cutPanel(
+            self._footprint(
+                "cutPcbPotentiometer",
+                (),
+                ("pcbPotentiometerHoleDiameterWithTolerance",),
+                lambda: self._cylinder(
+                    self.config["pcbPotentiometerHoleDiameterWithTolerance"]
+                ),
+            ).moved(self._at(x, y))
+        )
 
+    @_operation
     def previewPcbPotentiometer(self, x: float, y: float, lugsOrientation: str = "all"):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 6, 12)
-        self.previewBoxOnBack(x, y, 9.8, 9.8, 6.8)
+        self._addPreview(
+            self._footprint(
+                "previewPcbPotentiometer",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(6, 12, False),
+                    self._previewBox(9.8, 9.8, 6.8, True),
+                ),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def markPcbPotentiometer(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["potentiometerHoleDiameterWithTolerance"])
-        self.markCross(x, y)
+        self._markHoleAndCross(
+            self.config["potentiometerHoleDiameterWithTolerance"], [(x, y)]
+        )
 
+    @_operation
     def addPcbPotentiometer(
         self,
         x: float,
@@ -1705,11 +2892,22 @@ class SynthPrinter:
         self.previewPcbPotentiometer(x, y, lugsOrientation)
         self.markPcbPotentiometer(x, y)
 
+    @_operation
     def previewKnob(self, x: float, y: float, diameter: float, depth: float):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, diameter, depth + 5)
+        self._addPreview(
+            self._footprint(
+                "previewKnob",
+                (diameter, depth),
+                (),
+                lambda: self._previewCylinder(diameter, depth + 5, False),
+            ),
+            x,
+            y,
+        )
 
+    @_operation
     def addKnob(self, x: float, y: float, diameter: float, depth: float):
         """Adds a knob for preview only. Place it at the same location as
         potentiometers and rotary encoders!
@@ -1718,6 +2916,7 @@ class SynthPrinter:
         shaft is left exposed without a knob, it's not added automatically."""
         self.previewKnob(x, y, diameter, depth)
 
+    @_operation
     def cutSlider(
         self,
         x: float,
@@ -1729,19 +2928,14 @@ class SynthPrinter:
     ):
         if not self.config["panelRender"]:
             return
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .rect(
-                sliderWidth,
-                sliderHeight,
+        self._cutPanel(
+            self._boxTool(
+                x, y, sliderWidth, sliderHeight, self.config["sliderNotchDepth"]
             )
-            .cutBlind(-self.config["sliderNotchDepth"])
         )
         self.cutRect(x, y, slotWidth, slotHeight, 0, True)
 
+    @_operation
     def previewSlider(
         self, x: float, y: float, sliderWidth: float, sliderHeight: float
     ):
@@ -1750,6 +2944,7 @@ class SynthPrinter:
         self.previewCylinderOnFront(x, y, 15, 10)
         self.previewBoxOnBack(x, y, sliderWidth, sliderHeight, 22)
 
+    @_operation
     def markSlider(
         self,
         x: float,
@@ -1759,11 +2954,10 @@ class SynthPrinter:
         slotWidth: float,
         slotHeight: float,
     ):
-        if not self.config["drillTemplateRender"]:
-            return
         self.markRect(x, y, sliderWidth, sliderHeight)
         self.markRect(x, y, slotWidth, slotHeight)
 
+    @_operation
     def addSlider(
         self,
         x: float,
@@ -1789,35 +2983,72 @@ class SynthPrinter:
     ### Jacks & Sockets
     #######################################################################
 
+    @_operation
     def cutBigJack(self, x: float, y: float):
+        self.cutBigJacks([(x, y)])
+
+    @_operation
+    def cutBigJacks(self, points):
+        """`cutBigJack()` on every x, y of a list or NumPy array of points."""
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["bigJackDiameterWithTolerance"])
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .rect(
-                self.config["bigJackWidthWithTolerance"],
-                self.config["bigJackHeightWithTolerance"],
+        self._cutPanel(
+            *self._place(
+                self._footprint(
+                    "cutBigJack",
+                    (),
+                    (
+                        "bigJackDiameterWithTolerance",
+                        "bigJackWidthWithTolerance",
+                        "bigJackHeightWithTolerance",
+                        "bigJackNotchDepth",
+                    ),
+                    lambda: self._tools(
+                        self._cylinder(self.config["bigJackDiameterWithTolerance"]),
+                        self._box(
+                            self.config["bigJackWidthWithTolerance"],
+                            self.config["bigJackHeightWithTolerance"],
+                            self.config["bigJackNotchDepth"],
+                        ),
+                    ),
+                ),
+                points,
             )
-            .cutBlind(-self.config["bigJackNotchDepth"])
         )
 
+    @_operation
     def previewBigJack(self, x: float, y: float):
+        self.previewBigJacks([(x, y)])
+
+    @_operation
+    def previewBigJacks(self, points):
+        """`previewBigJack()` on every x, y of a list or NumPy array of points."""
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 8.5, 7)
-        self.previewCylinderOnFront(x, y, 12.6, 2.2)
-        self.previewBoxOnBack(x, y, 16, 16, 27)
+        self._addPreviews(
+            self._footprint(
+                "previewBigJack",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(8.5, 7, False),
+                    self._previewCylinder(12.6, 2.2, False),
+                    self._previewBox(16, 16, 27, True),
+                ),
+            ),
+            points,
+        )
 
+    @_operation
     def markBigJack(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["bigJackDiameterWithTolerance"])
-        self.markCross(x, y)
+        self.markBigJacks([(x, y)])
+
+    @_operation
+    def markBigJacks(self, points):
+        """`markBigJack()` on every x, y of a list or NumPy array of points."""
+        self._markHoleAndCross(self.config["bigJackDiameterWithTolerance"], points)
 
+    @_operation
     def addBigJack(self, x: float, y: float):
         """This fits panel mount 6.35mm jacks with a rectangular base, as used
         in Kosmo builds.
@@ -1828,35 +3059,78 @@ class SynthPrinter:
         self.previewBigJack(x, y)
         self.markBigJack(x, y)
 
+    @_operation
+    def addBigJacks(self, points):
+        """Adds many big jacks at once, see addBigJack() and addPotentiometers()."""
+        self.cutBigJacks(points)
+        self.previewBigJacks(points)
+        self.markBigJacks(points)
+
+    @_operation
     def cutMiniJack(self, x: float, y: float):
+        self.cutMiniJacks([(x, y)])
+
+    @_operation
+    def cutMiniJacks(self, points):
+        """`cutMiniJack()` on every x, y of a list or NumPy array of points."""
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["miniJackDiameterWithTolerance"])
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x, y)
-            .rect(
-                self.config["miniJackSizeWithTolerance"],
-                self.config["miniJackSizeWithTolerance"],
+        self._cutPanel(
+            *self._place(
+                self._footprint(
+                    "cutMiniJack",
+                    (),
+                    (
+                        "miniJackDiameterWithTolerance",
+                        "miniJackSizeWithTolerance",
+                        "miniJackNotchDepth",
+                    ),
+                    lambda: self._tools(
+                        self._cylinder(self.config["miniJackDiameterWithTolerance"]),
+                        self._box(
+                            self.config["miniJackSizeWithTolerance"],
+                            self.config["miniJackSizeWithTolerance"],
+                            self.config["miniJackNotchDepth"],
+                        ),
+                    ),
+                ),
+                points,
             )
-            .cutBlind(-self.config["miniJackNotchDepth"])
         )
 
+    @_operation
     def previewMiniJack(self, x: float, y: float):
+        self.previewMiniJacks([(x, y)])
+
+    @_operation
+    def previewMiniJacks(self, points):
+        """`previewMiniJack()` on every x, y of a list or NumPy array of points."""
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 6, 5.5)
-        self.previewCylinderOnFront(x, y, 8, 2.2)
-        self.previewBoxOnBack(x, y, 9, 10.5, 12.5)
+        self._addPreviews(
+            self._footprint(
+                "previewMiniJack",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(6, 5.5, False),
+                    self._previewCylinder(8, 2.2, False),
+                    self._previewBox(9, 10.5, 12.5, True),
+                ),
+            ),
+            points,
+        )
 
+    @_operation
     def markMiniJack(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["miniJackDiameterWithTolerance"])
-        self.markCross(x, y)
+        self.markMiniJacks([(x, y)])
+
+    @_operation
+    def markMiniJacks(self, points):
+        """`markMiniJack()` on every x, y of a list or NumPy array of points."""
+        self._markHoleAndCross(self.config["miniJackDiameterWithTolerance"], points)
 
+    @_operation
     def addMiniJack(self, x: float, y: float):
         """This fits 3.5mm PJ398SM "Thonkiconn" 3.5mm jacks and similar.
 
@@ -1866,45 +3140,62 @@ class SynthPrinter:
         self.previewMiniJack(x, y)
         self.markMiniJack(x, y)
 
+    @_operation
+    def addMiniJacks(self, points):
+        """Adds many mini jacks at once, see addMiniJack() and addPotentiometers()."""
+        self.cutMiniJacks(points)
+        self.previewMiniJacks(points)
+        self.markMiniJacks(points)
+
+    @_operation
     def cutMidiSocket(self, x: float, y: float, screws: str = "horizontal"):
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["midiSocketDiameterWithTolerance"])
-        if screws == "horizontal":
-            self.cutHole(
-                x - self.config["midiSocketScrewDistance"] / 2,
-                y,
-                self.config["midiSocketScrewDiameterWithTolerance"],
-            )
-            self.cutHole(
-                x + self.config["midiSocketScrewDistance"] / 2,
-                y,
-                self.config["midiSocketScrewDiameterWithTolerance"],
-            )
-        if screws == "vertical":
-            self.cutHole(
-                x,
-                y - self.config["midiSocketScrewDistance"] / 2,
-                self.config["midiSocketScrewDiameterWithTolerance"],
-            )
-            self.cutHole(
-                x,
-                y + self.config["midiSocketScrewDistance"] / 2,
-                self.config["midiSocketScrewDiameterWithTolerance"],
-            )
 
+        def build():
+            tools = [self._cylinder(self.config["midiSocketDiameterWithTolerance"])]
+            distance = self.config["midiSocketScrewDistance"] / 2
+            screw = self._cylinder(self.config["midiSocketScrewDiameterWithTolerance"])
+            if screws == "horizontal":
+                tools.append(self._offset(screw, -distance, 0))
+                tools.append(self._offset(screw, distance, 0))
+            if screws == "vertical":
+                tools.append(self._offset(screw, 0, -distance))
+                tools.append(self._offset(screw, 0, distance))
+            return self._tools(*tools)
+
+        self._cutPanel(
+            self._footprint(
+                "cutMidiSocket",
+                (screws,),
+                (
+                    "midiSocketDiameterWithTolerance",
+                    "midiSocketScrewDistance",
+                    "midiSocketScrewDiameterWithTolerance",
+                ),
+                build,
+            ).moved(self._at(x, y))
+        )
+
+    @_operation
     def previewMidiSocket(self, x: float, y: float, screws: str = "horizontal"):
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnBack(x, y, 14, 16)
-        if screws == "horizontal":
-            self.previewBoxOnFront(x, y, 28, 19, 1)
-        if screws == "vertical":
-            self.previewBoxOnFront(x, y, 19, 28, 1)
 
+        def build():
+            shapes = [self._previewCylinder(14, 16, True)]
+            if screws == "horizontal":
+                shapes.append(self._previewBox(28, 19, 1, False))
+            if screws == "vertical":
+                shapes.append(self._previewBox(19, 28, 1, False))
+            return self._fused(*shapes)
+
+        self._addPreview(
+            self._footprint("previewMidiSocket", (screws,), (), build), x, y
+        )
+
+    @_operation
     def markMidiSocket(self, x: float, y: float, screws: str = "horizontal"):
-        if not self.config["drillTemplateRender"]:
-            return
         self.markHole(x, y, self.config["midiSocketDiameterWithTolerance"])
         self.markCross(x, y)
         if screws == "horizontal":
@@ -1934,6 +3225,7 @@ class SynthPrinter:
             self.markCross(x, y - self.config["midiSocketScrewDistance"] / 2)
             self.markCross(x, y + self.config["midiSocketScrewDistance"] / 2)
 
+    @_operation
     def addMidiSocket(self, x: float, y: float, screws: str = "horizontal"):
         """Adds a panel mount female DIN socket.
 
@@ -1949,23 +3241,59 @@ class SynthPrinter:
     ### Blinkenlichten
     #######################################################################
 
+    @_operation
     def cutLed5mm(self, x: float, y: float):
+        self.cutLeds5mm([(x, y)])
+
+    @_operation
+    def cutLeds5mm(self, points):
+        """`cutLed5mm()` on every x, y of a list or NumPy array of points."""
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["5mmLedWithTolerance"])
+        self._cutPanel(
+            *self._place(
+                self._footprint(
+                    "cutLed5mm",
+                    (),
+                    ("5mmLedWithTolerance",),
+                    lambda: self._cylinder(self.config["5mmLedWithTolerance"]),
+                ),
+                points,
+            )
+        )
 
+    @_operation
     def previewLed5mm(self, x: float, y: float):
+        self.previewLeds5mm([(x, y)])
+
+    @_operation
+    def previewLeds5mm(self, points):
+        """`previewLed5mm()` on every x, y of a list or NumPy array of points."""
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 4.7, 3)
-        self.previewBoxOnBack(x, y, 4, 1, 17)
+        self._addPreviews(
+            self._footprint(
+                "previewLed5mm",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(4.7, 3, False),
+                    self._previewBox(4, 1, 17, True),
+                ),
+            ),
+            points,
+        )
 
+    @_operation
     def markLed5mm(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["5mmLedWithTolerance"])
-        self.markCross(x, y)
+        self.markLeds5mm([(x, y)])
+
+    @_operation
+    def markLeds5mm(self, points):
+        """`markLed5mm()` on every x, y of a list or NumPy array of points."""
+        self._markHoleAndCross(self.config["5mmLedWithTolerance"], points)
 
+    @_operation
     def addLed5mm(self, x: float, y: float):
         """Creates a hole for a 5mm LED protruding from the hole.
 
@@ -1975,23 +3303,66 @@ class SynthPrinter:
         self.previewLed5mm(x, y)
         self.markLed5mm(x, y)
 
+    @_operation
+    def addLeds5mm(self, points):
+        """Adds many 5mm LEDs at once, see addLed5mm() and addPotentiometers()."""
+        self.cutLeds5mm(points)
+        self.previewLeds5mm(points)
+        self.markLeds5mm(points)
+
+    @_operation
     def cutLed3mm(self, x: float, y: float):
+        self.cutLeds3mm([(x, y)])
+
+    @_operation
+    def cutLeds3mm(self, points):
+        """`cutLed3mm()` on every x, y of a list or NumPy array of points."""
         if not self.config["panelRender"]:
             return
-        self.cutHole(x, y, self.config["3mmLedWithTolerance"])
+        self._cutPanel(
+            *self._place(
+                self._footprint(
+                    "cutLed3mm",
+                    (),
+                    ("3mmLedWithTolerance",),
+                    lambda: self._cylinder(self.config["3mmLedWithTolerance"]),
+                ),
+                points,
+            )
+        )
 
+    @_operation
     def previewLed3mm(self, x: float, y: float):
+        self.previewLeds3mm([(x, y)])
+
+    @_operation
+    def previewLeds3mm(self, points):
+        """`previewLed3mm()` on every x, y of a list or NumPy array of points."""
         if not self.config["previewRender"]:
             return
-        self.previewCylinderOnFront(x, y, 2.8, 1)
-        self.previewBoxOnBack(x, y, 2.7, 1, 17)
+        self._addPreviews(
+            self._footprint(
+                "previewLed3mm",
+                (),
+                (),
+                lambda: self._fused(
+                    self._previewCylinder(2.8, 1, False),
+                    self._previewBox(2.7, 1, 17, True),
+                ),
+            ),
+            points,
+        )
 
+    @_operation
     def markLed3mm(self, x: float, y: float):
-        if not self.config["drillTemplateRender"]:
-            return
-        self.markHole(x, y, self.config["3mmLedWithTolerance"])
-        self.markCross(x, y)
+        self.markLeds3mm([(x, y)])
 
+    @_operation
+    def markLeds3mm(self, points):
+        """`markLed3mm()` on every x, y of a list or NumPy array of points."""
+        self._markHoleAndCross(self.config["3mmLedWithTolerance"], points)
+
+    @_operation
     def addLed3mm(self, x: float, y: float):
         """Creates a hole for a 3mm LED fitting inside the hole.
         On default settings, it will not protrude past the hole, and might
@@ -2003,6 +3374,14 @@ class SynthPrinter:
         self.previewLed3mm(x, y)
         self.markLed3mm(x, y)
 
+    @_operation
+    def addLeds3mm(self, points):
+        """Adds many 3mm LEDs at once, see addLed3mm() and addPotentiometers()."""
+        self.cutLeds3mm(points)
+        self.previewLeds3mm(points)
+        self.markLeds3mm(points)
+
+    @_operation
     def cutLedRectangular(self, x: float, y: float, orientation: str = "vertical"):
         if not self.config["panelRender"]:
             return
@@ -2021,6 +3400,7 @@ class SynthPrinter:
                 self.config["RectangularLedWidthWithTolerance"],
             )
 
+    @_operation
     def previewLedRectangular(self, x: float, y: float, orientation: str = "vertical"):
         if not self.config["previewRender"]:
             return
@@ -2033,9 +3413,8 @@ class SynthPrinter:
             self.previewBoxOnBack(x, y, 4, 1, 17)
             self.previewBoxOnFront(x, y, 5, 2, 2)
 
+    @_operation
     def markLedRectangular(self, x: float, y: float, orientation: str = "vertical"):
-        if not self.config["drillTemplateRender"]:
-            return
         if orientation == "vertical":
             self.markRect(
                 x,
@@ -2052,6 +3431,7 @@ class SynthPrinter:
             )
         self.markCross(x, y)
 
+    @_operation
     def addLedRectangular(self, x: float, y: float, orientation: str = "vertical"):
         """Creates a slot for a rectangular 2×5mm LED.
 
@@ -2063,6 +3443,7 @@ class SynthPrinter:
         self.previewLedRectangular(x, y, orientation)
         self.markLedRectangular(x, y, orientation)
 
+    @_operation
     def cutDisplayWindow(
         self,
         x: float,
@@ -2087,48 +3468,37 @@ class SynthPrinter:
             )
             .edges(">Z")
             .fillet(self.config["panelThickness"] * 0.99)
-            .translate(
-                (
-                    -self.config["panelWidth"] / 2 + x + windowHorizontalOffset,
-                    -self.config["panelHeight"] / 2 + y + windowVerticalOffset,
-                    0,
-                )
-            )
         )
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .cut(cutout)
+        self._cutPanel(
+            cutout.val().moved(
+                self._at(x + windowHorizontalOffset, y + windowVerticalOffset)
+            )
         )
 
         # Next, the actual cutout
-        self.panel = (
-            self.panel.faces(">Z")
-            .vertices("<XY")
-            .workplane(centerOption="CenterOfMass")
-            .center(x + windowHorizontalOffset, y + windowVerticalOffset)
-            .rect(windowWidth, windowHeight)
-            .cutThruAll()
+        self._cutPanel(
+            self._boxTool(
+                x + windowHorizontalOffset,
+                y + windowVerticalOffset,
+                windowWidth,
+                windowHeight,
+            )
         )
 
         # Now, the screws
         if addScrews:
-            self.panel = (
-                self.panel.faces(">Z")
-                .vertices("<XY")
-                .workplane(centerOption="CenterOfMass")
-                .center(x, y)
-                .rect(
-                    screwsHorizontalDistance,
-                    screwsVerticalDistance,
-                    forConstruction=True,
-                )
-                .vertices()
-                .circle(self.config["m2DiameterWithTolerance"] / 2)
-                .cutThruAll()
+            self._cutPanel(
+                *[
+                    self._cylinderTool(
+                        x + screwX * screwsHorizontalDistance / 2,
+                        y + screwY * screwsVerticalDistance / 2,
+                        self.config["m2DiameterWithTolerance"],
+                    )
+                    for screwX, screwY in ((-1, -1), (1, -1), (-1, 1), (1, 1))
+                ]
             )
 
+    @_operation
     def markDisplayWindow(
         self,
         x: float,
@@ -2141,8 +3511,6 @@ class SynthPrinter:
         screwsVerticalDistance: float = 40,
         addScrews: bool = True,
     ):
-        if not self.config["drillTemplateRender"]:
-            return
         self.markRect(
             x + windowHorizontalOffset,
             y + windowVerticalOffset,
@@ -2187,6 +3555,7 @@ class SynthPrinter:
                 y + screwsVerticalDistance / 2,
             )
 
+    @_operation
     def addDisplayWindow(
         self,
         x: float,
@@ -2245,6 +3614,9 @@ class SynthPrinter:
 ### Helpers
 #######################################################################
 
+# The grid helpers also work on NumPy arrays, converting every element,
+# e.g. ``kcol(np.arange(1, 5))``. See grid() to place footprints on them.
+
 
 def hp(hp: float):
     """Converts Eurorack Horizontal Pitch to millimeters (1hp = 0.2in = 5.08mm).
@@ -2289,4 +3661,609 @@ def erow(hrow: float):
     return (hrow) * hp(3.4) + offset
 
 
+def grid(columns, rows, x=kcol, y=krow, mask=None, skip=()):
+    """Lists the (x, y) points of a grid, to place many identical footprints
+    at once with methods such as `addMiniJacks()`:
+
+    ``sp.addMiniJacks(grid(range(1, 4), [4.5, 6, 7]))``
+
+    `columns` and `rows` are grid numbers (lists, ranges or NumPy arrays)
+    converted to millimeters by `x` and `y`, kcol and krow by default. Use
+    hcol and erow for the Eurorack grid, or any function of your own taking
+    and returning a number.
+
+    `mask` leaves out the cells that are False, it has one row of booleans
+    per row and one per column (a list of lists or a 2D NumPy array).
+    `skip` lists the (column, row) grid numbers of other cells to leave out.
+
+    Points go row by row, from the top-left.
+    """
+    xs = [float(x(float(column))) for column in columns]
+    ys = [float(y(float(row))) for row in rows]
+    skipped = {(float(column), float(row)) for column, row in skip}
+    points = []
+    for rowIndex, row in enumerate(rows):
+        for columnIndex, column in enumerate(columns):
+            if mask is not None and not mask[rowIndex][columnIndex]:
+                continue
+            if (float(column), float(row)) in skipped:
+                continue
+            points.append((xs[columnIndex], ys[rowIndex]))
+    return points
+
+
+#######################################################################
+### Drill template files
+#######################################################################
+
+# Paper sizes for exportDrillTemplate(), in mm, portrait
+paperSizes = {"A4": (210, 297), "Letter": (215.9, 279.4)}
+
+
+def exportDrillTemplates(
+    panels: list,
+    filename: str = "DrillTemplates.pdf",
+    paper: str = "A4",
+    margin: float = 10,
+    overlap: float = 15,
+):
+    """Exports the drill templates of many panels at once: to a single PDF
+    with all their pages, or numbered SVG files. See
+    `SynthPrinter.exportDrillTemplate()` for the parameters.
+
+    `panels` is a list of SynthPrinter objects, or of (SynthPrinter, name)
+    pairs to label their pages."""
+    panels = [
+        panel if isinstance(panel, tuple) else (panel, f"Panel {index + 1}")
+        for index, panel in enumerate(panels)
+    ]
+    _writeDrillTemplates(panels, filename, paper, margin, overlap)
+
+
+def _writeDrillTemplates(panels, filename, paper, margin, overlap):
+    """Lays out the pages of every (panel, name), and writes them as PDF or
+    SVG depending on the extension."""
+    pages = []
+    for sp, name in panels:
+        marks = sp._drillTemplateMarks()
+        (pageWidth, pageHeight), tiles = sp._drillTemplatePages(paper, margin, overlap)
+        registration = sp._registrationMarks(tiles, overlap) if paper else []
+        for index, tile in enumerate(tiles):
+            label = None
+            if paper:
+                label = f"page {index + 1} of {len(tiles)}"
+                if name:
+                    label = f"{name}, {label}"
+            pages.append(
+                {
+                    "size": (pageWidth, pageHeight),
+                    "offset": (margin, margin) if paper else (0, 0),
+                    "tile": tile,
+                    "marks": marks,
+                    "registration": registration,
+                    "thickness": sp.config["DrillTemplateMarkThickness"],
+                    "length": sp.config["DrillTemplateMarkLength"],
+                    "label": label,
+                }
+            )
+    if filename.lower().endswith(".pdf"):
+        with open(filename, "wb") as file:
+            file.write(_pdfDocument([_pdfPage(page) for page in pages]))
+        return
+    root, extension = os.path.splitext(filename)
+    for index, page in enumerate(pages):
+        if len(pages) > 1:
+            filename = f"{root}-{index + 1}{extension}"
+        with open(filename, "w") as file:
+            file.write(_svgPage(page))
+
+
+# Marks are drawn the same way in both formats: strokes are centered on the
+# path, so shapes are inset by half the thickness to stay the size of the
+# hole, like the 3D marks.
+
+
+def _svgPage(page: dict):
+    """A page of the drill template as a SVG document, in mm."""
+    width, height = page["size"]
+    offsetX, offsetY = page["offset"]
+    tileX, tileY, tileWidth, tileHeight = page["tile"]
+    thickness = page["thickness"]
+    length = page["length"]
+    elements = [
+        '<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+        f'width="{width:.3f}mm" height="{height:.3f}mm" '
+        f'viewBox="0 0 {width:.3f} {height:.3f}">',
+        '<clipPath id="tile">'
+        f'<rect x="{tileX:.3f}" y="{tileY:.3f}" '
+        f'width="{tileWidth:.3f}" height="{tileHeight:.3f}"/></clipPath>',
+        f'<g transform="translate({offsetX - tileX:.3f} {offsetY - tileY:.3f})">',
+        f'<g clip-path="url(#tile)" fill="none" stroke-width="{thickness}">',
+        '<g stroke="#ff0000">',
+    ]
+    for kind, x, y, *size in page["marks"]:
+        if kind == "circle":
+            elements.append(
+                f'<circle cx="{x:.3f}" cy="{y:.3f}" '
+                f'r="{size[0] / 2 - thickness / 2:.3f}"/>'
+            )
+        elif kind == "cross":
+            elements.append(
+                f'<path d="M {x - length / 2:.3f} {y:.3f} h {length:.3f} '
+                f'M {x:.3f} {y - length / 2:.3f} v {length:.3f}"/>'
+            )
+        elif kind in ("rect", "slot"):
+            width, height = size
+            radius = (height - thickness) / 2 if kind == "slot" else 0
+            elements.append(
+                f'<rect x="{x - width / 2 + thickness / 2:.3f}" '
+                f'y="{y - height / 2 + thickness / 2:.3f}" '
+                f'width="{width - thickness:.3f}" '
+                f'height="{height - thickness:.3f}" rx="{radius:.3f}"/>'
+            )
+    elements.append('</g><g stroke="#000000">')
+    for x, y in page["registration"]:
+        elements.append(
+            f'<circle cx="{x:.3f}" cy="{y:.3f}" r="3"/>'
+            f'<path d="M {x - 5:.3f} {y:.3f} h 10 M {x:.3f} {y - 5:.3f} v 10"/>'
+        )
+    elements.append("</g></g></g>")
+    if page["label"]:
+        bottom = offsetY + tileHeight + 5
+        elements.append(
+            f'<path d="M {offsetX:.3f} {bottom:.3f} h 50" stroke="#000000" '
+            f'stroke-width="{thickness}"/>'
+            f'<text x="{offsetX + 52:.3f}" y="{bottom + 1:.3f}" font-size="3" '
+            f'font-family="sans-serif">50 mm. {html.escape(page["label"])}</text>'
+        )
+    elements.append("</svg>")
+    return "\n".join(elements) + "\n"
+
+
+def _pdfPage(page: dict):
+    """A page of the drill template as a PDF content stream. Returns the
+    size of the page in points and the stream."""
+    width, height = page["size"]
+    offsetX, offsetY = page["offset"]
+    tileX, tileY, tileWidth, tileHeight = page["tile"]
+    thickness = page["thickness"]
+    length = page["length"]
+    scale = 72 / 25.4
+    # Millimeters from the top-left, like SVG
+    operators = [f"q {scale:.6f} 0 0 {-scale:.6f} 0 {height * scale:.3f} cm"]
+    operators.append(
+        f"{offsetX:.3f} {offsetY:.3f} {tileWidth:.3f} {tileHeight:.3f} re W n"
+    )
+    operators.append(f"1 0 0 1 {offsetX - tileX:.3f} {offsetY - tileY:.3f} cm")
+    operators.append(f"{thickness} w 1 0 0 RG")
+    for kind, x, y, *size in page["marks"]:
+        if kind == "circle":
+            operators.append(_pdfCircle(x, y, size[0] / 2 - thickness / 2))
+        elif kind == "cross":
+            operators.append(
+                f"{x - length / 2:.3f} {y:.3f} m {x + length / 2:.3f} {y:.3f} l "
+                f"{x:.3f} {y - length / 2:.3f} m {x:.3f} {y + length / 2:.3f} l"
+            )
+        elif kind in ("rect", "slot"):
+            width, height = size[0] - thickness, size[1] - thickness
+            if kind == "slot":
+                operators.append(_pdfSlot(x, y, width, height))
+            else:
+                operators.append(
+                    f"{x - width / 2:.3f} {y - height / 2:.3f} "
+                    f"{width:.3f} {height:.3f} re"
+                )
+    operators.append("S 0 0 0 RG")
+    for x, y in page["registration"]:
+        operators.append(_pdfCircle(x, y, 3))
+        operators.append(
+            f"{x - 5:.3f} {y:.3f} m {x + 5:.3f} {y:.3f} l "
+            f"{x:.3f} {y - 5:.3f} m {x:.3f} {y + 5:.3f} l"
+        )
+    operators.append("S Q")
+    if page["label"]:
+        bottom = (page["size"][1] - offsetY - tileHeight - 5) * scale
+        label = page["label"].replace("\\", "\\\\")
+        label = label.replace("(", "\\(").replace(")", "\\)")
+        operators.append(
+            f"{thickness * scale:.3f} w {offsetX * scale:.3f} {bottom:.3f} m "
+            f"{(offsetX + 50) * scale:.3f} {bottom:.3f} l S"
+        )
+        operators.append(
+            f"BT /F1 8 Tf {(offsetX + 52) * scale:.3f} {bottom - 3:.3f} Td "
+            f"(50 mm. {label}) Tj ET"
+        )
+    size = (page["size"][0] * scale, page["size"][1] * scale)
+    return size, "\n".join(operators).encode("latin-1", "replace")
+
+
+def _pdfCircle(x: float, y: float, radius: float):
+    """A circle path made of four Bézier curves."""
+    k = radius * 0.5523
+    return (
+        f"{x + radius:.3f} {y:.3f} m "
+        f"{x + radius:.3f} {y + k:.3f} {x + k:.3f} {y + radius:.3f} {x:.3f} {y + radius:.3f} c "
+        f"{x - k:.3f} {y + radius:.3f} {x - radius:.3f} {y + k:.3f} {x - radius:.3f} {y:.3f} c "
+        f"{x - radius:.3f} {y - k:.3f} {x - k:.3f} {y - radius:.3f} {x:.3f} {y - radius:.3f} c "
+        f"{x + k:.3f} {y - radius:.3f} {x + radius:.3f} {y - k:.3f} {x + radius:.3f} {y:.3f} c h"
+    )
+
+
+def _pdfSlot(x: float, y: float, width: float, height: float):
+    """A horizontal slot path, with round ends."""
+    radius = height / 2
+    k = radius * 0.5523
+    left, right = x - width / 2 + radius, x + width / 2 - radius
+    top, bottom = y - radius, y + radius
+    return (
+        f"{left:.3f} {top:.3f} m {right:.3f} {top:.3f} l "
+        f"{right + k:.3f} {top:.3f} {right + radius:.3f} {y - k:.3f} {right + radius:.3f} {y:.3f} c "
+        f"{right + radius:.3f} {y + k:.3f} {right + k:.3f} {bottom:.3f} {right:.3f} {bottom:.3f} c "
+        f"{left:.3f} {bottom:.3f} l "
+        f"{left - k:.3f} {bottom:.3f} {left - radius:.3f} {y + k:.3f} {left - radius:.3f} {y:.3f} c "
+        f"{left - radius:.3f} {y - k:.3f} {left - k:.3f} {top:.3f} {left:.3f} {top:.3f} c h"
+    )
+
+
+def _pdfDocument(pages: list):
+    """A minimal PDF file from (size, content stream) pages, with Helvetica
+    for the labels."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # The page tree, once the pages are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for (width, height), stream in pages:
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R "
+                f"/MediaBox [0 0 {width:.3f} {height:.3f}] "
+                f"/Contents {len(objects)} 0 R "
+                "/Resources << /Font << /F1 3 0 R >> >> >>"
+            ).encode()
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    objects[1] = objects[1].encode()
+    document = b"%PDF-1.4\n"
+    offsets = []
+    for number, content in enumerate(objects, 1):
+        offsets.append(len(document))
+        document += b"%d 0 obj\n" % number + content + b"\nendobj\n"
+    xref = len(document)
+    document += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        document += b"%010d 00000 n \n" % offset
+    document += b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1)
+    document += b"startxref\n%d\n%%%%EOF\n" % xref
+    return document
+
+
+#######################################################################
+### 3MF files
+#######################################################################
+
+
+def _write3MF(filename: str, parts: list, tolerance: float, angularTolerance: float):
+    """Writes (name, shape, color) parts to a 3MF file. With more than one
+    part, they are grouped in a single object, so slicers load them as the
+    parts of one print, in place. Every part has its own material, named
+    after it."""
+    materials = "".join(
+        '<base name="{}" displaycolor="#{:02X}{:02X}{:02X}"/>'.format(
+            html.escape(name), *(int(value) for value in color)
+        )
+        for name, _, color in parts
+    )
+    resources = [f'<basematerials id="1">{materials}</basematerials>']
+    for index, (name, shape, _) in enumerate(parts):
+        vertices, triangles = _mesh(shape, tolerance, angularTolerance)
+        resources.append(
+            f'<object id="{index + 2}" name="{html.escape(name)}" type="model" '
+            f'pid="1" pindex="{index}"><mesh><vertices>'
+        )
+        resources.extend(
+            f'<vertex x="{x:.4f}" y="{y:.4f}" z="{z:.4f}"/>' for x, y, z in vertices
+        )
+        resources.append("</vertices><triangles>")
+        resources.extend(
+            f'<triangle v1="{a}" v2="{b}" v3="{c}"/>' for a, b, c in triangles
+        )
+        resources.append("</triangles></mesh></object>")
+    item = 2
+    if len(parts) > 1:
+        item = len(parts) + 2
+        name = os.path.splitext(os.path.basename(filename))[0]
+        resources.append(
+            f'<object id="{item}" name="{html.escape(name)}" type="model">'
+            "<components>"
+            + "".join(
+                f'<component objectid="{index + 2}"/>' for index in range(len(parts))
+            )
+            + "</components></object>"
+        )
+    model = "\n".join(
+        [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<model unit="millimeter" xml:lang="en-US" '
+            'xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">',
+            '<metadata name="Application">Synth Printer</metadata>',
+            "<resources>",
+            *resources,
+            "</resources>",
+            f'<build><item objectid="{item}"/></build>',
+            "</model>",
+        ]
+    )
+    with zipfile.ZipFile(filename, "w", zipfile.ZIP_DEFLATED) as file:
+        file.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'content-types"><Default Extension="rels" ContentType="application/'
+            'vnd.openxmlformats-package.relationships+xml"/><Default Extension='
+            '"model" ContentType="application/vnd.ms-package.3dmanufacturing-'
+            '3dmodel+xml"/></Types>',
+        )
+        file.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/'
+            'relationships"><Relationship Target="/3D/3dmodel.model" Id="rel0" '
+            'Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>'
+            "</Relationships>",
+        )
+        file.writestr("3D/3dmodel.model", model)
+
+
+def _mesh(shape, tolerance: float, angularTolerance: float):
+    """Tessellates a shape into arrays of vertices and triangles. Faces are
+    meshed separately, so the vertices they share are merged, to give
+    slicers a closed mesh."""
+    faces = list(_faceMeshes(shape, tolerance, angularTolerance))
+    if not faces:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=int)
+    offsets = np.cumsum([0] + [len(vertices) for vertices, _ in faces[:-1]])
+    vertices = np.concatenate([vertices for vertices, _ in faces])
+    triangles = np.concatenate(
+        [triangles + offset for (_, triangles), offset in zip(faces, offsets)]
+    )
+    vertices, merged = np.unique(vertices.round(4), axis=0, return_inverse=True)
+    triangles = merged.reshape(-1)[triangles]
+    # Tiny triangles can collapse when merging their vertices
+    a, b, c = triangles.T
+    return vertices, triangles[(a != b) & (b != c) & (c != a)]
+
+
+def _faceMeshes(shape, tolerance: float, angularTolerance: float):
+    """Tessellates a shape, and yields the (vertices, triangles) arrays of
+    its faces one by one, triangles facing outwards. Tolerances like
+    `Shape.tessellate()`.
+
+    Each face is meshed on its own, and its triangulation removed as soon
+    as it's copied, so only one face is ever meshed at a time, and the
+    shape is left without any."""
+    for face in shape.Faces():
+        BRepMesh_IncrementalMesh(face.wrapped, tolerance, True, angularTolerance)
+        location = TopLoc_Location()
+        triangulation = BRep_Tool.Triangulation_s(face.wrapped, location)
+        if triangulation is None:
+            continue
+        # Nodes are read as a flat run of numbers, and moved all at once
+        count = triangulation.NbNodes()
+        nodes = np.fromiter(
+            (
+                value
+                for index in range(1, count + 1)
+                for value in triangulation.Node(index).Coord()
+            ),
+            float,
+            count * 3,
+        ).reshape(-1, 3)
+        transformation = location.Transformation()
+        matrix = np.array(
+            [
+                [transformation.Value(row, column) for column in range(1, 5)]
+                for row in range(1, 4)
+            ]
+        )
+        vertices = nodes @ matrix[:, :3].T + matrix[:, 3]
+        triangles = (
+            np.array(
+                [
+                    triangulation.Triangle(index).Get()
+                    for index in range(1, triangulation.NbTriangles() + 1)
+                ],
+                dtype=int,
+            ).reshape(-1, 3)
+            - 1
+        )
+        BRepTools.Clean_s(face.wrapped)
+        if face.wrapped.Orientation() == TopAbs_REVERSED:
+            triangles = triangles[:, ::-1]
+        yield vertices, triangles
+
+
+# A triangle of a binary STL file
+_stlTriangle = np.dtype(
+    [("normal", "<f4", 3), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")]
+)
+
+
+def _writeSTL(filename: str, shape, tolerance: float, angularTolerance: float):
+    """Writes a shape to a binary STL file, one face at a time, so only the
+    triangles of one face are ever in memory on top of the shape."""
+    count = 0
+    with open(filename, "wb") as file:
+        file.write(b"Synth Printer".ljust(80, b" "))
+        file.write(np.uint32(0).tobytes())  # Triangle count, see below
+        for vertices, triangles in _faceMeshes(shape, tolerance, angularTolerance):
+            corners = vertices[triangles]
+            normals = np.cross(
+                corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]
+            )
+            lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+            records = np.zeros(len(triangles), _stlTriangle)
+            records["normal"] = np.divide(
+                normals, lengths, out=np.zeros_like(normals), where=lengths > 0
+            )
+            records["vertices"] = corners
+            file.write(records.tobytes())
+            count += len(records)
+        file.seek(80)
+        file.write(np.uint32(count).tobytes())
+
+
+#######################################################################
+### Command line
+#######################################################################
+
+
+def buildPanels(
+    scripts: list,
+    outputDirectory: str = "build",
+    formats: tuple = ("stl", "step", "svg"),
+    workers: int = None,
+    paper: str = None,
+):
+    """Runs panel scripts without CQ Editor, and exports every panel they
+    create to `outputDirectory`, with one script per process of a pool of
+    `workers` processes (one per core by default).
+
+    The panel layer is exported as `<script>.stl` and/or `<script>.step`,
+    the supports and emboss layers get their own files when they aren't
+    empty. `<script>.3mf` has all three in a single file, see export3MF().
+    The drill template is exported as `<script>.svg` and/or
+    `<script>.pdf`, tiled on `paper` if given, see exportDrillTemplate().
+
+    Scripts are run as if they were the main program, with a `show_object`
+    that does nothing, and their settings untouched, so a panel comes out
+    the same as in CQ Editor. Disable previewRender in a script, or enable
+    lazyLayers, to skip building the previews. A failing script doesn't
+    stop the others. Returns a list of (script, seconds, error) tuples,
+    error is None on success.
+
+    Also available from the command line, for example:
+    ``python synthprinter.py example-*.py -o build -j 4``
+    """
+    os.makedirs(outputDirectory, exist_ok=True)
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_buildPanel, script, outputDirectory, tuple(formats), paper)
+            for script in scripts
+        ]
+        for future in concurrent.futures.as_completed(futures):
+            script, seconds, error = future.result()
+            print(
+                "{:>8.2f}s  {}  {}".format(
+                    seconds, "FAILED" if error else "ok    ", script
+                ),
+                flush=True,
+            )
+            if error:
+                print(error, file=sys.stderr, flush=True)
+            results.append((script, seconds, error))
+    return results
+
+
+def _showNothing(*args, **kwargs):
+    """The show_object given to scripts by buildPanels()."""
+
+
+def _buildPanel(script: str, outputDirectory: str, formats: tuple, paper: str):
+    """Runs one script for buildPanels(), in a worker process."""
+    start = time.perf_counter()
+    try:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+        scope = runpy.run_path(
+            script,
+            init_globals={"show_object": _showNothing},
+            run_name="__main__",
+        )
+        panels = [value for value in scope.values() if isinstance(value, SynthPrinter)]
+        if not panels:
+            raise ValueError("No SynthPrinter object in " + script)
+        stem = os.path.splitext(os.path.basename(script))[0]
+        for index, sp in enumerate(panels):
+            if not sp._rendered:
+                sp.render()
+            name = os.path.join(
+                outputDirectory, stem if len(panels) == 1 else f"{stem}-{index + 1}"
+            )
+            for layer, suffix in (
+                ("panel", ""),
+                ("supports", "-supports"),
+                ("emboss", "-emboss"),
+            ):
+                if sp._layerShape(layer) is None:
+                    continue
+                if "stl" in formats:
+                    sp.exportSTL(f"{name}{suffix}.stl", layer)
+                if "step" in formats:
+                    sp.exportSTEP(f"{name}{suffix}.step", layer)
+            if "3mf" in formats:
+                sp.export3MF(f"{name}.3mf", ("panel", "supports", "emboss"))
+            for extension in ("svg", "pdf"):
+                if extension in formats:
+                    sp.exportDrillTemplate(f"{name}.{extension}", paper)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+    return script, time.perf_counter() - start, error
+
+
+def _main():
+    parser = argparse.ArgumentParser(
+        description="Renders Synth Printer panel scripts and exports them."
+    )
+    parser.add_argument("scripts", nargs="+", help="panel scripts, or glob patterns")
+    parser.add_argument(
+        "-o", "--output", default="build", help="output directory (default: build)"
+    )
+    parser.add_argument(
+        "-f",
+        "--formats",
+        default="stl,step,svg",
+        help="comma-separated list of stl, step, 3mf, svg, pdf "
+        "(default: stl,step,svg)",
+    )
+    parser.add_argument(
+        "-p",
+        "--paper",
+        choices=sorted(paperSizes),
+        help="tile the drill templates on pages of this size",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=None, help="default: one per core"
+    )
+    args = parser.parse_args()
+    scripts = []
+    for pattern in args.scripts:
+        scripts.extend(sorted(glob.glob(pattern)) or [pattern])
+    start = time.perf_counter()
+    results = buildPanels(
+        scripts, args.output, tuple(args.formats.split(",")), args.workers, args.paper
+    )
+    failed = [script for script, _, error in results if error]
+    print(
+        f"{len(results) - len(failed)} panels built, {len(failed)} failed, "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    # Run the command line from the importable module, so the scripts'
+    # `from synthprinter import *` gives the same SynthPrinter class
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import synthprinter
+
+    synthprinter._main()
+
+
 # To generate API reference: ``pdoc synthprinter.py -o ./``